@@ -0,0 +1,26 @@
+"""Add meetings.media_hash for transcript de-duplication
+
+Revision ID: 3b9f1c2d7e41
+Revises: 67cf2bf30c4e
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b9f1c2d7e41'
+down_revision = '67cf2bf30c4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('meetings', sa.Column('media_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_meetings_media_hash'), 'meetings', ['media_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_meetings_media_hash'), table_name='meetings')
+    op.drop_column('meetings', 'media_hash')
@@ -0,0 +1,35 @@
+"""Add composite indexes for meeting list and transcript reads
+
+Revision ID: 8d4e2a6c1f53
+Revises: 3b9f1c2d7e41
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4e2a6c1f53'
+down_revision = '3b9f1c2d7e41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block on PostgreSQL
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_meetings_user_created', 'meetings', ['user_id', sa.text('created_at DESC')],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_subtitles_meeting_start', 'subtitles', ['meeting_id', 'start_time'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_subtitles_meeting_start', table_name='subtitles', postgresql_concurrently=True)
+        op.drop_index('ix_meetings_user_created', table_name='meetings', postgresql_concurrently=True)
@@ -0,0 +1,36 @@
+"""Denormalize subtitle/task counts and analysis flag onto meetings
+
+Revision ID: 5c7a9e3d2b18
+Revises: 8d4e2a6c1f53
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c7a9e3d2b18'
+down_revision = '8d4e2a6c1f53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('meetings', sa.Column('subtitle_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('meetings', sa.Column('task_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('meetings', sa.Column('has_analysis', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    # Backfill from the child tables
+    op.execute("""
+        UPDATE meetings SET
+            subtitle_count = (SELECT COUNT(*) FROM subtitles s WHERE s.meeting_id = meetings.id),
+            task_count = (SELECT COUNT(*) FROM tasks t WHERE t.meeting_id = meetings.id),
+            has_analysis = EXISTS (SELECT 1 FROM ai_results a WHERE a.meeting_id = meetings.id)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('meetings', 'has_analysis')
+    op.drop_column('meetings', 'task_count')
+    op.drop_column('meetings', 'subtitle_count')
@@ -0,0 +1,29 @@
+"""Add composite task index for dashboard status/priority counts
+
+Revision ID: 9e1f4b7a6c25
+Revises: 5c7a9e3d2b18
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9e1f4b7a6c25'
+down_revision = '5c7a9e3d2b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block on PostgreSQL
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_meeting_status_priority', 'tasks', ['meeting_id', 'status', 'priority'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_meeting_status_priority', table_name='tasks', postgresql_concurrently=True)
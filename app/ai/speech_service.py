@@ -1,7 +1,10 @@
+import asyncio
 import logging
 import io
+import multiprocessing
 import os
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from app.core.config import settings
 
@@ -142,3 +145,51 @@ def get_speech_processor():
             return None
     return processor
 
+
+
+# ── Worker processes ──────────────────────────────────────
+# Whisper/pyannote inference holds the GIL for most of a chunk, so live audio
+# is transcribed in a small process pool. Each worker loads its own model once
+# (the initializer) and keeps it for its lifetime.
+_speech_pool: ProcessPoolExecutor | None = None
+
+
+def _process_chunk_in_worker(audio_bytes: bytes) -> dict | None:
+    worker_processor = get_speech_processor()
+    return worker_processor.process_chunk(audio_bytes) if worker_processor else None
+
+
+def _warm_worker() -> bool:
+    return get_speech_processor() is not None
+
+
+def get_speech_pool() -> ProcessPoolExecutor:
+    global _speech_pool
+    if _speech_pool is None:
+        workers = settings.speech_workers or max(1, (os.cpu_count() or 2) // 2)
+        _speech_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            # spawn: never fork a process that is running an event loop and threads
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=get_speech_processor,
+        )
+    return _speech_pool
+
+
+async def transcribe_chunk(audio_bytes: bytes) -> dict | None:
+    """Run process_chunk() on a pool worker without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_speech_pool(), _process_chunk_in_worker, audio_bytes)
+
+
+async def warm_speech_workers() -> None:
+    """Start a pool worker so its model is loaded before the first chunk arrives."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(get_speech_pool(), _warm_worker)
+
+
+def shutdown_speech_pool() -> None:
+    global _speech_pool
+    if _speech_pool is not None:
+        _speech_pool.shutdown(wait=False, cancel_futures=True)
+        _speech_pool = None
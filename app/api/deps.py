@@ -1,13 +1,14 @@
 from fastapi import Depends, HTTPException, status, Query as QueryParam, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select
 from typing import Optional
 
 from app.core.security import decode_token
 from app.core.config import settings
 from app.core.token_revocation import is_jti_revoked
 from app.db.session import get_db
+from app.models.meeting import Meeting
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/login")
@@ -91,3 +92,30 @@ async def get_current_user_or_token(
         raise credentials_exception
         
     return user
+
+
+async def _fetch_owned_meeting(db: AsyncSession, meeting_id: int, user_id: int) -> Meeting:
+    # lambda_stmt: the statement is compiled once and re-bound per request
+    stmt = lambda_stmt(lambda: select(Meeting).where(Meeting.id == meeting_id, Meeting.user_id == user_id))
+    meeting = (await db.execute(stmt)).scalar_one_or_none()
+    if meeting is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return meeting
+
+
+async def get_owned_meeting(
+    meeting_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Meeting:
+    """Load the path's meeting for the current user, or 404."""
+    return await _fetch_owned_meeting(db, meeting_id, current_user.id)
+
+
+async def get_owned_meeting_or_token(
+    meeting_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_or_token),
+) -> Meeting:
+    """Same as get_owned_meeting, for download endpoints that accept ?token=."""
+    return await _fetch_owned_meeting(db, meeting_id, current_user.id)
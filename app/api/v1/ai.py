@@ -18,7 +18,7 @@ from app.models.ai_result import AIResult
 from app.models.job import Job
 from app.ai.orchestrator import AIAgentOrchestrator
 from app.ai.rag import rag_store
-from app.tasks.ai_tasks import analyze_meeting_background, _run_ai_pipeline
+from app.tasks.ai_tasks import analyze_meeting_background, run_analysis_job
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 logger = logging.getLogger("meetingai.ai")
@@ -94,37 +94,8 @@ async def analyze_meeting(
         db.add(new_job)
         await db.commit()
 
-        # Define an async fallback since Redis/Celery is not running
-        async def run_ai():
-            try:
-                # Update status
-                from app.db.session import AsyncSessionLocal
-                from sqlalchemy import update
-                async with AsyncSessionLocal() as session:
-                    await session.execute(update(Job).where(Job.id == job_id).values(status="processing", progress=10))
-                    await session.commit()
-
-                # Run main logic
-                result_id = await _run_ai_pipeline(meeting_id, job_id)
-                rag_store.invalidate(meeting_id)
-
-                async with AsyncSessionLocal() as session:
-                    await session.execute(update(Job).where(Job.id == job_id).values(
-                        status="completed", progress=100, result_id=result_id
-                    ))
-                    await session.commit()
-            except Exception as exc:
-                logger.error(f"Analysis failed for job {job_id}: {exc}", exc_info=True)
-                from app.db.session import AsyncSessionLocal
-                from sqlalchemy import update
-                async with AsyncSessionLocal() as session:
-                    await session.execute(update(Job).where(Job.id == job_id).values(
-                        status="failed", error=str(exc)
-                    ))
-                    await session.commit()
-
-        # Enqueue background task
-        background_tasks.add_task(run_ai)
+        # Run in-process since Redis/Celery is not running
+        background_tasks.add_task(run_analysis_job, meeting_id, job_id)
 
         return {
             "status": "processing",
@@ -1,25 +1,39 @@
 """
 Meetings API — CRUD, Dashboard, Transcript, Statistics, and Media Upload
 """
+import hashlib
 import logging
 import os
 import tempfile
 import asyncio
+import uuid
+from datetime import datetime, timezone
+from itertools import repeat
 from urllib.parse import quote
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, status, Response, Request
-from sqlalchemy import func, select, desc
+
+import aiofiles
+import aiofiles.os
+import httpx
+import numpy as np
+import orjson
+from cachetools import LRUCache
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, UploadFile, File, Form, status, Response, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Boolean, DateTime, delete, desc, func, insert, lambda_stmt, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from app.api.deps import get_current_user, get_current_user_or_token
+from app.api.deps import get_current_user, get_owned_meeting, get_owned_meeting_or_token
 from app.db.session import get_db
 from app.models.meeting import Meeting
 from app.models.subtitle import Subtitle
-from app.models.task import Task
 from app.models.ai_result import AIResult
 from app.models.participant import Participant
 from app.models.user import User
 from app.schemas.meeting import (
     DashboardStats,
+    MediaUploadAccepted,
     MeetingCreate,
     MeetingListOut,
     MeetingOut,
@@ -31,25 +45,67 @@ router = APIRouter(prefix="/meetings", tags=["meetings"])
 logger = logging.getLogger("meetingai.meetings")
 
 
-# ── Helpers ───────────────────────────────────────────────
-async def _reconstruct_transcript(db: AsyncSession, meeting_id: int) -> str:
-    """Rebuild transcript from subtitle timeline."""
+# ── Statement building blocks ─────────────────────────────
+# Built once at import; hot queries wrap them in lambda_stmt() so SQLAlchemy
+# caches the compiled SQL and only re-binds parameters on each request.
+# Child counts and the analysis flag are denormalized onto meetings, so list
+# reads are a plain scan of one table.
+_MEETING_LIST_COLUMNS = (
+    Meeting.id,
+    Meeting.user_id,
+    Meeting.title,
+    Meeting.consent_given,
+    Meeting.created_at,
+    Meeting.ended_at,
+    Meeting.subtitle_count,
+    Meeting.task_count,
+    Meeting.has_analysis,
+)
+
+
+# meeting_id -> ((subtitle count, max subtitle id), lines). Subtitles are
+# append-only, so that pair changes whenever the transcript does.
+_transcript_cache: LRUCache = LRUCache(maxsize=1024)
+
+
+async def _transcript_lines(db: AsyncSession, meeting_id: int) -> list[str]:
+    """'Speaker: text' lines in timeline order (one per subtitle)."""
+    version = tuple((await db.execute(
+        select(func.count(Subtitle.id), func.max(Subtitle.id)).where(Subtitle.meeting_id == meeting_id)
+    )).one())
+    cached = _transcript_cache.get(meeting_id)
+    if cached is not None and cached[0] == version:
+        return list(cached[1])
+
     result = await db.execute(
-        select(Subtitle)
-        .filter(Subtitle.meeting_id == meeting_id)
-        .order_by(Subtitle.start_time)
-    )
-    subtitles = result.scalars().all()
-    
-    if not subtitles:
-        return ""
-    return "\n".join(
-        f"{s.speaker_name or s.speaker_id}: {s.text}" for s in subtitles
+        select(Subtitle.speaker_name, Subtitle.speaker_id, Subtitle.text)
+        .where(Subtitle.meeting_id == meeting_id)
+        # Same order as _stream_transcript: live subtitles all share start_time 0.0
+        .order_by(Subtitle.start_time, Subtitle.id)
     )
+    lines = [f"{name or speaker_id}: {text}" for name, speaker_id, text in result]
+    _transcript_cache[meeting_id] = (version, tuple(lines))
+    return lines
+
+
+async def _reconstruct_transcript(db: AsyncSession, meeting_id: int) -> str:
+    """Rebuild transcript from subtitle timeline."""
+    return "\n".join(await _transcript_lines(db, meeting_id))
 
 
-async def _enrich_meeting(db: AsyncSession, meeting: Meeting, include_analysis: bool = False) -> dict:
-    """Convert Meeting ORM to enriched dict with computed fields."""
+def _meeting_out(
+    meeting: Meeting,
+    subtitle_count: int,
+    task_count: int,
+    has_analysis: bool,
+    transcript: str | None = None,
+    ai_result: AIResult | None = None,
+) -> MeetingOut:
+    """Assemble MeetingOut from already-fetched values.
+
+    Every field comes from typed DB columns, so the model is built with
+    model_construct() instead of being validated field-by-field.
+    """
     data = {
         "id": meeting.id,
         "user_id": meeting.user_id,
@@ -57,39 +113,129 @@ async def _enrich_meeting(db: AsyncSession, meeting: Meeting, include_analysis:
         "consent_given": meeting.consent_given,
         "created_at": meeting.created_at,
         "ended_at": meeting.ended_at,
+        "subtitle_count": subtitle_count or 0,
+        "task_count": task_count or 0,
+        "has_analysis": has_analysis,
+        "transcript": transcript,
     }
+    if ai_result:
+        data["summary"] = ai_result.summary_json
+        data["actions"] = ai_result.actions_json
+        data["risks"] = ai_result.risks_json
+        data["sentiment"] = ai_result.sentiment_json
+    return MeetingOut.model_construct(**data)
 
-    # Execute counts efficiently
-    sub_count = await db.execute(select(func.count(Subtitle.id)).filter(Subtitle.meeting_id == meeting.id))
-    data["subtitle_count"] = sub_count.scalar() or 0
 
-    task_count = await db.execute(select(func.count(Task.id)).filter(Task.meeting_id == meeting.id))
-    data["task_count"] = task_count.scalar() or 0
+async def _enrich_meeting(db: AsyncSession, meeting: Meeting, include_analysis: bool = False) -> MeetingOut:
+    """Build MeetingOut from the ORM row plus computed fields."""
+    if include_analysis:
+        # Detail view: AI result plus the transcript; the subtitle count
+        # falls out of the transcript rows.
+        ai_result = await db.scalar(select(AIResult).where(AIResult.meeting_id == meeting.id))
+        lines = await _transcript_lines(db, meeting.id)
+        return _meeting_out(
+            meeting, len(lines), meeting.task_count, ai_result is not None,
+            transcript="\n".join(lines), ai_result=ai_result,
+        )
 
-    ai_res = await db.execute(select(AIResult).filter(AIResult.meeting_id == meeting.id))
-    ai_result = ai_res.scalars().first()
-    data["has_analysis"] = ai_result is not None
+    return _meeting_out(meeting, meeting.subtitle_count, meeting.task_count, meeting.has_analysis)
 
-    if include_analysis:
-        data["transcript"] = await _reconstruct_transcript(db, meeting.id)
-        if ai_result:
-            data["summary"] = ai_result.summary_json
-            data["actions"] = ai_result.actions_json
-            data["risks"] = ai_result.risks_json
-            data["sentiment"] = ai_result.sentiment_json
 
-    return data
+def _model_response(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
+    """Serialize an already-trusted response model without FastAPI re-validating it."""
+    return Response(content=model.model_dump_json(), media_type="application/json", status_code=status_code)
+
+
+def _json_response(payload) -> Response:
+    """Serialize a plain dict/list payload with orjson, skipping response_model validation."""
+    return Response(content=orjson.dumps(payload), media_type="application/json")
+
+
+def _parse_transcript_lines(transcript: str) -> tuple[list[str], list[str]]:
+    """Split 'Speaker: text' lines into parallel speaker/text columns."""
+    speakers: list[str] = []
+    texts: list[str] = []
+    add_speaker = speakers.append
+    add_text = texts.append
+    for line in transcript.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+
+        speaker, sep, text = line.partition(":")
+        if sep:
+            text = text.strip()
+            if not text:
+                continue
+            add_speaker(speaker.strip())
+        else:
+            add_speaker("Speaker")
+            text = line
+        add_text(text)
+    return speakers, texts
+
+
+async def _insert_transcript_subtitles(db: AsyncSession, meeting_id: int, transcript: str, confidence: float) -> int:
+    """Bulk-load 'Speaker: text' lines as Subtitle rows on a synthetic timeline.
+
+    Timings are computed column-wise (duration = max(2s, len/15), start = running
+    sum), then the batch goes out as one COPY on asyncpg or one executemany INSERT
+    elsewhere.
+    """
+    speakers, texts = _parse_transcript_lines(transcript)
+    if not texts:
+        return 0
+
+    lengths = np.fromiter(map(len, texts), dtype=np.float64, count=len(texts))
+    durations = np.maximum(2.0, lengths / 15.0)
+    ends = np.cumsum(durations)
+    starts = np.concatenate(([0.0], ends[:-1]))
+
+    conn = await db.connection()
+    if conn.dialect.driver == "asyncpg":
+        created_at = datetime.utcnow()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            Subtitle.__tablename__,
+            records=zip(
+                repeat(meeting_id), speakers, speakers, texts,
+                starts.tolist(), ends.tolist(), repeat(confidence), repeat(created_at),
+            ),
+            columns=[
+                "meeting_id", "speaker_id", "speaker_name", "text",
+                "start_time", "end_time", "confidence", "created_at",
+            ],
+        )
+    else:
+        await db.execute(insert(Subtitle), [
+            {
+                "meeting_id": meeting_id,
+                "speaker_id": speaker,
+                "speaker_name": speaker,
+                "text": text,
+                "start_time": start,
+                "end_time": end,
+                "confidence": confidence,
+            }
+            for speaker, text, start, end in zip(speakers, texts, starts.tolist(), ends.tolist())
+        ])
+    # Bulk paths skip the ORM counter listeners, so bump the count here
+    await db.execute(
+        update(Meeting)
+        .where(Meeting.id == meeting_id)
+        .values(subtitle_count=Meeting.subtitle_count + len(texts))
+        .execution_options(synchronize_session=False)
+    )
+    return len(texts)
+
+
+# Strips path/reserved characters and ASCII control characters in one C-level pass
+_FILENAME_STRIP_TABLE = {**str.maketrans("", "", '<>:"/\\|?*'), **dict.fromkeys(range(32))}
 
 
 def _sanitize_filename(filename: str | None, default: str = "download.txt") -> str:
-    if not filename:
-        filename = default
-    cleaned = "".join(
-        ch for ch in filename
-        if ch not in '<>:"/\\|?*' and ord(ch) >= 32
-    ).strip().lstrip(".")
-    cleaned = cleaned or default
-    return cleaned[:180]
+    cleaned = (filename or default).translate(_FILENAME_STRIP_TABLE).strip().lstrip(".")
+    return (cleaned or default)[:180]
 
 
 def _build_meeting_filename(title: str | None, suffix: str) -> str:
@@ -113,55 +259,28 @@ async def create_meeting(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    meeting = Meeting(
-        user_id=current_user.id,
-        title=sanitize_input(payload.title),
-        consent_given=payload.consent_given,
-    )
-    db.add(meeting)
-    await db.commit()
-    await db.refresh(meeting)
+    # INSERT ... RETURNING hands back the generated id/created_at without a refresh SELECT
+    meeting = (await db.scalars(
+        insert(Meeting)
+        .values(
+            user_id=current_user.id,
+            title=sanitize_input(payload.title),
+            consent_given=payload.consent_given,
+        )
+        .returning(Meeting)
+    )).one()
 
+    # Meeting and subtitles land in one transaction — a single commit
+    saved_count = 0
     if payload.transcript:
-        lines = payload.transcript.split("\n")
-        current_time = 0.0
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            parts = line.split(":", 1)
-            if len(parts) == 2:
-                speaker = parts[0].strip()
-                text = parts[1].strip()
-            else:
-                speaker = "Speaker"
-                text = line
-
-            if not text:
-                continue
-
-            duration = max(2.0, len(text) / 15.0)
-
-            sub = Subtitle(
-                meeting_id=meeting.id,
-                speaker_id=speaker,
-                speaker_name=speaker,
-                text=text,
-                start_time=current_time,
-                end_time=current_time + duration,
-                confidence=1.0,
-            )
-            db.add(sub)
-            current_time += duration
-
-        await db.commit()
-        logger.info("Created meeting %d with %d subtitle lines", meeting.id, len(lines))
+        saved_count = await _insert_transcript_subtitles(db, meeting.id, payload.transcript, confidence=1.0)
+        logger.info("Created meeting %d with %d subtitle lines", meeting.id, saved_count)
+    await db.commit()
 
     from app.core.redis import invalidate_cache
     await invalidate_cache(f"user:{current_user.id}:")
-    return await _enrich_meeting(db, meeting, include_analysis=False)
+    # A brand-new meeting has no tasks or analysis yet
+    return _model_response(_meeting_out(meeting, saved_count, 0, False), status_code=status.HTTP_201_CREATED)
 
 
 # ── List Meetings ────────────────────────────────────────
@@ -181,55 +300,21 @@ async def list_meetings(
     if not search and not status:
         cached = await get_cache(cache_key)
         if cached:
-            return cached
-
-    # Single query with subquery counts — no N+1
-    sub_count = (
-        select(func.count(Subtitle.id))
-        .where(Subtitle.meeting_id == Meeting.id)
-        .correlate(Meeting)
-        .scalar_subquery()
-    )
-    task_count = (
-        select(func.count(Task.id))
-        .where(Task.meeting_id == Meeting.id)
-        .correlate(Meeting)
-        .scalar_subquery()
-    )
-    has_ai = (
-        select(func.count(AIResult.id))
-        .where(AIResult.meeting_id == Meeting.id)
-        .correlate(Meeting)
-        .scalar_subquery()
-    )
+            return _json_response(cached)
 
-    stmt = (
-        select(
-            Meeting.id,
-            Meeting.user_id,
-            Meeting.title,
-            Meeting.consent_given,
-            Meeting.created_at,
-            Meeting.ended_at,
-            sub_count.label("subtitle_count"),
-            task_count.label("task_count"),
-            (has_ai > 0).label("has_analysis"),
-        )
-        .where(Meeting.user_id == current_user.id)
-    )
+    # Single query over meetings alone — counts are stored on the row
+    uid = current_user.id
+    stmt = lambda_stmt(lambda: select(*_MEETING_LIST_COLUMNS).where(Meeting.user_id == uid))
     if search:
-        stmt = stmt.where(Meeting.title.ilike(f"%{search}%"))
-    # Filter by analysis status using EXISTS subquery
+        pattern = f"%{search}%"
+        stmt += lambda s: s.where(Meeting.title.ilike(pattern))
+    # Filter by analysis status
     if status == "analyzed":
-        stmt = stmt.where(
-            select(AIResult.id).where(AIResult.meeting_id == Meeting.id).exists()
-        )
+        stmt += lambda s: s.where(Meeting.has_analysis.is_(True))
     elif status == "pending":
-        stmt = stmt.where(
-            ~select(AIResult.id).where(AIResult.meeting_id == Meeting.id).exists()
-        )
+        stmt += lambda s: s.where(Meeting.has_analysis.is_(False))
 
-    stmt = stmt.order_by(desc(Meeting.created_at)).offset(skip).limit(limit)
+    stmt += lambda s: s.order_by(desc(Meeting.created_at)).offset(skip).limit(limit)
     result = await db.execute(stmt)
     rows = result.all()
 
@@ -251,33 +336,27 @@ async def list_meetings(
     if not search and not status:
         await set_cache(cache_key, meetings_list, ttl=300)
 
-    return meetings_list
+    return _json_response(meetings_list)
 
 
 
 # ── Dashboard ─────────────────────────────────────────────
-@router.get("/dashboard", response_model=DashboardStats)
-async def dashboard(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    uid = current_user.id
-    from sqlalchemy import text
-    from app.core.redis import get_cache, set_cache
-
-    cache_key = f"user:{uid}:dashboard_stats"
-    cached = await get_cache(cache_key)
-    if cached:
-        return cached
-
-    # ── QUERY 1: All stats in ONE roundtrip (Optimized O(N) pass) ──
-    stats_sql = text("""
-        WITH user_meetings AS (
-            SELECT id FROM meetings WHERE user_id = :uid
-        )
+DASHBOARD_CACHE_TTL = 60
+DASHBOARD_WARM_INTERVAL = 600
+DASHBOARD_WARM_MAX_REFRESHES = 10
+# user_id -> warm-up passes since that user last read their dashboard
+_dashboard_prefetch_counts: dict[int, int] = {}
+
+_DASHBOARD_SQL = text("""
+    WITH user_meetings AS (
+        SELECT id, user_id, title, consent_given, created_at, ended_at,
+               subtitle_count, task_count, has_analysis
+        FROM meetings WHERE user_id = :uid
+    ),
+    stats AS (
         SELECT
             (SELECT COUNT(id) FROM user_meetings) AS total_meetings,
-            (SELECT COUNT(id) FROM ai_results WHERE meeting_id IN (SELECT id FROM user_meetings)) AS analyzed_meetings,
+            (SELECT COUNT(id) FROM user_meetings WHERE has_analysis) AS analyzed_meetings,
             COUNT(t.id) AS total_tasks,
             COUNT(t.id) FILTER (WHERE t.status = 'todo') AS tasks_todo,
             COUNT(t.id) FILTER (WHERE t.status = 'in-progress') AS tasks_in_progress,
@@ -285,41 +364,67 @@ async def dashboard(
             COUNT(t.id) FILTER (WHERE t.priority = 'high') AS high_priority
         FROM tasks t
         WHERE t.meeting_id IN (SELECT id FROM user_meetings)
-    """)
-    stats_row = (await db.execute(stats_sql, {"uid": uid})).one()
-
-    # ── QUERY 2: Recent meetings with counts ──
-    sub_count = (
-        select(func.count(Subtitle.id))
-        .where(Subtitle.meeting_id == Meeting.id)
-        .correlate(Meeting)
-        .scalar_subquery()
+    ),
+    recent AS (
+        SELECT m.*
+        FROM user_meetings m
+        ORDER BY m.created_at DESC
+        LIMIT 5
     )
-    t_count = (
-        select(func.count(Task.id))
-        .where(Task.meeting_id == Meeting.id)
-        .correlate(Meeting)
-        .scalar_subquery()
-    )
-    has_ai = (
-        select(func.count(AIResult.id))
-        .where(AIResult.meeting_id == Meeting.id)
-        .correlate(Meeting)
-        .scalar_subquery()
-    )
-    recent_q = (
-        select(
-            Meeting.id, Meeting.user_id, Meeting.title,
-            Meeting.consent_given, Meeting.created_at, Meeting.ended_at,
-            sub_count.label("subtitle_count"),
-            t_count.label("task_count"),
-            (has_ai > 0).label("has_analysis"),
-        )
-        .where(Meeting.user_id == uid)
-        .order_by(desc(Meeting.created_at))
-        .limit(5)
-    )
-    recent_rows = (await db.execute(recent_q)).all()
+    SELECT 'stats' AS kind,
+           NULL AS id, NULL AS user_id, NULL AS title, NULL AS consent_given,
+           NULL AS created_at, NULL AS ended_at,
+           NULL AS subtitle_count, NULL AS task_count, NULL AS has_analysis,
+           total_meetings, analyzed_meetings, total_tasks,
+           tasks_todo, tasks_in_progress, tasks_done, high_priority
+    FROM stats
+    UNION ALL
+    SELECT 'recent', id, user_id, title, consent_given, created_at, ended_at,
+           subtitle_count, task_count, has_analysis,
+           NULL, NULL, NULL, NULL, NULL, NULL, NULL
+    FROM recent
+    ORDER BY kind DESC, created_at DESC
+""").columns(consent_given=Boolean, created_at=DateTime, ended_at=DateTime, has_analysis=Boolean)
+
+
+@router.get("/dashboard", response_model=DashboardStats)
+async def dashboard(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    uid = current_user.id
+    from app.core.redis import get_cache, get_local_cache, set_cache, set_local_cache
+
+    # A read keeps this user's cache on the warm-up list
+    _dashboard_prefetch_counts[uid] = 0
+
+    # In-process TTL cache first, then Redis (shared across workers)
+    cache_key = f"user:{uid}:dashboard_stats"
+    cached = get_local_cache(cache_key)
+    if cached:
+        return _json_response(cached)
+    cached = await get_cache(cache_key)
+    if cached:
+        set_local_cache(cache_key, cached)
+        return _json_response(cached)
+
+    response_data = await _build_dashboard(db, uid)
+    set_local_cache(cache_key, response_data)
+    await set_cache(cache_key, response_data, ttl=DASHBOARD_CACHE_TTL)
+    return _json_response(response_data)
+
+
+async def _build_dashboard(db: AsyncSession, uid: int) -> dict:
+    """Compute the dashboard payload for one user (uncached)."""
+    # ── QUERY 1: Stats + 5 recent meetings in ONE roundtrip ──
+    # Row kind='stats' carries the aggregates, kind='recent' rows the meetings.
+    stats_row = None
+    recent_rows = []
+    for row in (await db.execute(_DASHBOARD_SQL, {"uid": uid})).all():
+        if row.kind == "stats":
+            stats_row = row
+        else:
+            recent_rows.append(row)
 
     recent_enriched = [
         {
@@ -332,17 +437,21 @@ async def dashboard(
     ]
 
     # Calculate meeting durations
-    durations_res = await db.execute(select(Meeting.created_at, Meeting.ended_at).where(Meeting.user_id == uid, Meeting.ended_at != None))
+    durations_res = await db.execute(lambda_stmt(
+        lambda: select(Meeting.created_at, Meeting.ended_at).where(Meeting.user_id == uid, Meeting.ended_at != None)
+    ))
     durations = [(r.ended_at - r.created_at).total_seconds() / 60.0 for r in durations_res.all()]
     avg_duration = sum(durations) / len(durations) if durations else 0.0
     longest_duration = max(durations) if durations else 0.0
 
     # ── Meeting Frequency Analytics ──
-    from datetime import datetime, timedelta
+    from datetime import timedelta
     from collections import Counter
     now = datetime.utcnow()
     week_ago = now - timedelta(days=7)
-    freq_res = await db.execute(select(Meeting.created_at).where(Meeting.user_id == uid, Meeting.created_at >= week_ago))
+    freq_res = await db.execute(lambda_stmt(
+        lambda: select(Meeting.created_at).where(Meeting.user_id == uid, Meeting.created_at >= week_ago)
+    ))
     week_meetings = freq_res.scalars().all()
     day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
     day_counts = Counter(d.strftime("%A") for d in week_meetings)
@@ -354,7 +463,7 @@ async def dashboard(
     }
 
     # ── Calendar Heatmap ──
-    all_dates_res = await db.execute(select(Meeting.created_at).where(Meeting.user_id == uid))
+    all_dates_res = await db.execute(lambda_stmt(lambda: select(Meeting.created_at).where(Meeting.user_id == uid)))
     all_dates = all_dates_res.scalars().all()
     calendar_heatmap = {}
     for d in day_names:
@@ -363,7 +472,9 @@ async def dashboard(
         calendar_heatmap[d.strftime("%a")] = calendar_heatmap.get(d.strftime("%a"), 0) + 1
 
     # ── Keyword Trends (top words across all recent titles) ──
-    titles_res = await db.execute(select(Meeting.title).where(Meeting.user_id == uid).order_by(desc(Meeting.created_at)).limit(50))
+    titles_res = await db.execute(lambda_stmt(
+        lambda: select(Meeting.title).where(Meeting.user_id == uid).order_by(desc(Meeting.created_at)).limit(50)
+    ))
     titles = titles_res.scalars().all()
     stop_words = {"the","a","an","meeting","and","or","with","for","on","in","to","of","is","are"}
     all_kw = []
@@ -389,26 +500,80 @@ async def dashboard(
         "calendar_heatmap": calendar_heatmap,
     }
 
-    await set_cache(cache_key, response_data, ttl=60)
     return response_data
 
 
+async def warm_dashboard_caches() -> None:
+    """Background loop: re-prime dashboard caches for active users before they expire.
+
+    Users with a meeting created in the last hour, or who have read their
+    dashboard recently, are refreshed every DASHBOARD_WARM_INTERVAL seconds.
+    A user is dropped after DASHBOARD_WARM_MAX_REFRESHES refreshes without a read.
+    Every worker runs this loop; a Redis lock lets one of them do each pass.
+    """
+    from datetime import timedelta
+    from app.core.redis import set_cache, set_local_cache, try_acquire_lock
+    from app.db.session import AsyncSessionLocal
+
+    while True:
+        await asyncio.sleep(DASHBOARD_WARM_INTERVAL)
+        try:
+            if not await try_acquire_lock("lock:dashboard_warm", DASHBOARD_WARM_INTERVAL // 2):
+                continue
+            since = datetime.utcnow() - timedelta(hours=1)
+            async with AsyncSessionLocal() as session:
+                active = await session.scalars(
+                    select(Meeting.user_id).where(Meeting.created_at >= since).distinct()
+                )
+                for uid in active:
+                    _dashboard_prefetch_counts.setdefault(uid, 0)
+
+                warmed = 0
+                for uid, refreshes in list(_dashboard_prefetch_counts.items()):
+                    if refreshes >= DASHBOARD_WARM_MAX_REFRESHES:
+                        _dashboard_prefetch_counts.pop(uid, None)
+                        continue
+                    data = await _build_dashboard(session, uid)
+                    cache_key = f"user:{uid}:dashboard_stats"
+                    set_local_cache(cache_key, data)
+                    # Normal TTL: analysis jobs and live subtitles change these
+                    # counts without invalidating the cache
+                    await set_cache(cache_key, data, ttl=DASHBOARD_CACHE_TTL)
+                    _dashboard_prefetch_counts[uid] = refreshes + 1
+                    warmed += 1
+            logger.debug("Warmed dashboard cache for %d users", warmed)
+        except Exception as exc:
+            logger.warning("Dashboard cache warm-up failed: %s", exc)
+
+
 # ── Get Single Meeting (full detail) ─────────────────────
 @router.get("/{meeting_id}", response_model=MeetingOut)
 async def get_meeting(
     meeting_id: int,
+    include_transcript: bool = Query(True, description="Set false and page it via /transcript instead"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(
-        select(Meeting).filter(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
-    )
-    meeting = result.scalar_one_or_none()
-    
-    if not meeting:
+    # Meeting + AI result (joined) in one statement, transcript in a second
+    meeting = (await db.scalars(
+        select(Meeting)
+        .options(joinedload(Meeting.ai_result))
+        .where(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
+    )).one_or_none()
+    if meeting is None:
         raise HTTPException(status_code=404, detail="Meeting not found")
-        
-    return await _enrich_meeting(db, meeting, include_analysis=True)
+
+    if not include_transcript:
+        return _model_response(_meeting_out(
+            meeting, meeting.subtitle_count, meeting.task_count, meeting.ai_result is not None,
+            ai_result=meeting.ai_result,
+        ))
+
+    lines = await _transcript_lines(db, meeting.id)
+    return _model_response(_meeting_out(
+        meeting, len(lines), meeting.task_count, meeting.ai_result is not None,
+        transcript="\n".join(lines), ai_result=meeting.ai_result,
+    ))
 
 
 # ── Meeting Stats (Comprehensive Analytics Engine) ────────
@@ -421,24 +586,30 @@ async def meeting_stats(
     import re
     from collections import Counter
 
-    result = await db.execute(
-        select(Meeting).filter(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
-    )
-    meeting = result.scalar_one_or_none()
-    if not meeting:
+    # Ownership check and scalar figures in one round-trip
+    totals = (await db.execute(
+        select(
+            Meeting,
+            select(func.max(Subtitle.end_time)).where(Subtitle.meeting_id == meeting_id).scalar_subquery().label("duration"),
+            select(func.count(Participant.id)).where(Participant.meeting_id == meeting_id).scalar_subquery().label("participant_count"),
+        )
+        .where(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
+    )).one_or_none()
+    if totals is None:
         raise HTTPException(status_code=404, detail="Meeting not found")
+    meeting = totals.Meeting
+    subtitle_count = meeting.subtitle_count
+    duration = totals.duration if subtitle_count else None
 
+    # The analytics below walk every line, so fetch only the columns they read
     sub_res = await db.execute(
-        select(Subtitle).filter(Subtitle.meeting_id == meeting_id).order_by(Subtitle.start_time)
+        select(Subtitle.speaker_name, Subtitle.speaker_id, Subtitle.text, Subtitle.start_time, Subtitle.end_time)
+        .where(Subtitle.meeting_id == meeting_id)
+        .order_by(Subtitle.start_time, Subtitle.id)
     )
-    subtitles = sub_res.scalars().all()
+    subtitles = sub_res.all()
 
     speakers = list({s.speaker_name or s.speaker_id for s in subtitles})
-    duration = max((s.end_time for s in subtitles), default=0) if subtitles else None
-
-    t_count = await db.execute(select(func.count(Task.id)).filter(Task.meeting_id == meeting_id))
-    p_count = await db.execute(select(func.count(Participant.id)).filter(Participant.meeting_id == meeting_id))
-    ai_check = await db.execute(select(AIResult).filter(AIResult.meeting_id == meeting_id))
 
     # ── Accumulators ──
     speaking_time: dict[str, float] = {}
@@ -587,7 +758,7 @@ async def meeting_stats(
 
     # ── Engagement ──
     duration_mins = (duration or 1.0) / 60.0
-    subtitle_density = len(subtitles) / max(1.0, duration_mins)
+    subtitle_density = subtitle_count / max(1.0, duration_mins)
     engagement_score = min(100, int((len(speakers) * 10) + (subtitle_density * 2) + (topic_changes * 5))) if subtitles else 0
 
     # ── Keyword Cloud & TF-IDF Title ──
@@ -600,10 +771,10 @@ async def meeting_stats(
 
     return {
         "meeting_id": meeting_id,
-        "subtitle_count": len(subtitles),
-        "task_count": t_count.scalar() or 0,
-        "participant_count": p_count.scalar() or 0,
-        "has_analysis": ai_check.scalars().first() is not None,
+        "subtitle_count": subtitle_count,
+        "task_count": meeting.task_count,
+        "participant_count": totals.participant_count or 0,
+        "has_analysis": meeting.has_analysis,
         "duration_seconds": duration,
         "speakers": speakers,
         "speaking_time": speaking_time,
@@ -636,25 +807,28 @@ async def update_meeting(
 ):
     from app.core.redis import invalidate_cache
 
-    result = await db.execute(
-        select(Meeting).filter(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
-    )
-    meeting = result.scalar_one_or_none()
-    
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Meeting not found")
-
     updates = payload.model_dump(exclude_none=True)
-    for key, value in updates.items():
-        if key == "title" and value:
-            value = sanitize_input(value)
-        setattr(meeting, key, value)
-        
+    if updates.get("title"):
+        updates["title"] = sanitize_input(updates["title"])
+    if not updates:
+        meeting = await get_owned_meeting(meeting_id, db, current_user)
+        return _model_response(await _enrich_meeting(db, meeting, include_analysis=True))
+
+    # One UPDATE ... RETURNING with ownership in the WHERE clause: no prior
+    # SELECT, and no row back means the meeting is missing or not ours.
+    meeting = (await db.scalars(
+        update(Meeting)
+        .where(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
+        .values(**updates)
+        .returning(Meeting)
+        .execution_options(populate_existing=True)
+    )).one_or_none()
+    if meeting is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
     await db.commit()
-    await db.refresh(meeting)
 
     await invalidate_cache(f"user:{current_user.id}:")
-    return await _enrich_meeting(db, meeting, include_analysis=True)
+    return _model_response(await _enrich_meeting(db, meeting, include_analysis=True))
 
 
 # ── Delete Meeting ────────────────────────────────────────
@@ -666,17 +840,18 @@ async def delete_meeting(
 ):
     from app.core.redis import invalidate_cache
 
+    # One DELETE scoped to the owner; subtitles, tasks, participants and
+    # AI results go with it through the ON DELETE CASCADE foreign keys.
     result = await db.execute(
-        select(Meeting).filter(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
+        delete(Meeting).where(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
     )
-    meeting = result.scalar_one_or_none()
-    
-    if not meeting:
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
     logger.info("Deleting meeting %d for user %d", meeting_id, current_user.id)
-    await db.delete(meeting)
     await db.commit()
+    # Ids can be reused after a delete (SQLite rowids), so drop the entry outright
+    _transcript_cache.pop(meeting_id, None)
 
     await invalidate_cache(f"user:{current_user.id}:")
 
@@ -688,6 +863,24 @@ ALLOWED_MEDIA_TYPES = {
     "audio/ogg", "audio/mp4", "audio/x-m4a", "audio/m4a",
 }
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100 MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB — peak per-request buffer while streaming to disk
+MEDIA_SPOOL_MAX_SIZE = 8 * 1024 * 1024  # Uploads up to 8 MB stay in memory; larger ones spill to disk
+MIN_FILE_SIZE = 1000
+TRANSCRIPT_CACHE_TTL = 30 * 24 * 3600  # Re-uploads of identical media skip Gemini for 30 days
+
+
+# content type -> (minimum prefix length, ((offset, signature), ...)); every signature must match
+_ISO_BMFF = (12, ((4, b"ftyp"),))  # mp4/m4a/mov: bytes 4..7 are usually "ftyp"
+_EBML = (4, ((0, b"\x1a\x45\xdf\xa3"),))  # WebM / Matroska
+_RIFF_WAVE = (12, ((0, b"RIFF"), (8, b"WAVE")))
+_MEDIA_SIGNATURES: dict[str, tuple[int, tuple[tuple[int, bytes], ...]]] = {
+    "video/mp4": _ISO_BMFF, "audio/mp4": _ISO_BMFF, "audio/x-m4a": _ISO_BMFF,
+    "audio/m4a": _ISO_BMFF, "video/quicktime": _ISO_BMFF,
+    "video/webm": _EBML, "audio/webm": _EBML, "video/x-matroska": _EBML,
+    "audio/wav": _RIFF_WAVE, "audio/x-wav": _RIFF_WAVE,
+    "audio/ogg": (4, ((0, b"OggS"),)),
+}
+_MP3_TYPES = {"audio/mpeg", "audio/mp3"}
 
 
 def _matches_media_magic(content_type: str, chunk: bytes) -> bool:
@@ -696,65 +889,226 @@ def _matches_media_magic(content_type: str, chunk: bytes) -> bool:
         return False
     ct = (content_type or "").lower()
 
-    if ct in {"video/mp4", "audio/mp4", "audio/x-m4a", "audio/m4a", "video/quicktime"}:
-        # ISO Base Media File Format (mp4/m4a/mov): bytes 4..7 are usually "ftyp".
-        return len(chunk) >= 12 and chunk[4:8] == b"ftyp"
-    if ct in {"video/webm", "audio/webm", "video/x-matroska"}:
-        # EBML header for WebM / Matroska.
-        return chunk.startswith(b"\x1a\x45\xdf\xa3")
-    if ct in {"audio/wav", "audio/x-wav"}:
-        return len(chunk) >= 12 and chunk.startswith(b"RIFF") and chunk[8:12] == b"WAVE"
-    if ct == "audio/ogg":
-        return chunk.startswith(b"OggS")
-    if ct in {"audio/mpeg", "audio/mp3"}:
+    if ct in _MP3_TYPES:
+        # ID3 tag, or a bare MPEG frame sync (11 set bits)
         return chunk.startswith(b"ID3") or (len(chunk) >= 2 and chunk[0] == 0xFF and (chunk[1] & 0xE0) == 0xE0)
-    return True
+    spec = _MEDIA_SIGNATURES.get(ct)
+    if spec is None:
+        return True
+    min_len, signatures = spec
+    return len(chunk) >= min_len and all(chunk.startswith(sig, offset) for offset, sig in signatures)
+
+
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com"
+GEMINI_FILE_POLL_INTERVAL = 2.0
+GEMINI_FILE_POLL_ATTEMPTS = 150
 
 
-from celery import shared_task
+async def _remove_temp_file(file_path: str) -> None:
+    """Delete a temp upload off the event loop, ignoring files that are already gone."""
+    try:
+        await aiofiles.os.remove(file_path)
+    except OSError:
+        pass
+
 
-@shared_task
-def _transcribe_with_gemini(file_path: str, mime_type: str) -> str:
-    """Use Gemini to transcribe audio/video file (sync, runs in worker)."""
-    from google import genai
+async def _stream_file(file_path: str):
+    """Yield the file in UPLOAD_CHUNK_SIZE pieces without blocking the event loop."""
+    async with aiofiles.open(file_path, "rb") as f:
+        while chunk := await f.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+
+# Strong refs so fire-and-forget cleanup tasks are not garbage-collected mid-flight
+_gemini_cleanups: set[asyncio.Task] = set()
+
+
+async def _delete_gemini_file(file_name: str) -> None:
+    """Best-effort removal of an uploaded media file from Gemini storage."""
+    from app.core.config import settings
+
+    try:
+        async with httpx.AsyncClient(
+            base_url=GEMINI_API_BASE, headers={"x-goog-api-key": settings.gemini_api_key}, timeout=30.0
+        ) as client:
+            await client.delete(f"/v1beta/{file_name}")
+    except Exception:
+        logger.debug("Gemini file cleanup failed for %s", file_name)
+
+
+async def _transcribe_with_gemini_async(media: str | bytes, mime_type: str) -> str:
+    """Use Gemini to transcribe audio/video over the REST API (fully async).
+
+    ``media`` is either a temp-file path (large uploads) or the raw bytes of a
+    small upload that was kept in memory.
+    """
     from app.core.config import settings
 
     if not settings.gemini_api_key:
         raise ValueError("Gemini API key not configured")
 
-    client = genai.Client(api_key=settings.gemini_api_key)
+    headers = {"x-goog-api-key": settings.gemini_api_key}
+    in_memory = isinstance(media, bytes)
+    file_size = len(media) if in_memory else os.path.getsize(media)
+
+    async with httpx.AsyncClient(base_url=GEMINI_API_BASE, headers=headers, timeout=600.0) as client:
+        logger.info("Uploading media file to Gemini for transcription...")
+
+        # Resumable upload: open a session, then stream the bytes in one finalize call
+        start = await client.post(
+            "/upload/v1beta/files",
+            headers={
+                "X-Goog-Upload-Protocol": "resumable",
+                "X-Goog-Upload-Command": "start",
+                "X-Goog-Upload-Header-Content-Length": str(file_size),
+                "X-Goog-Upload-Header-Content-Type": mime_type,
+            },
+            json={"file": {"display_name": "upload" if in_memory else os.path.basename(media)}},
+        )
+        start.raise_for_status()
+        upload_url = start.headers["x-goog-upload-url"]
+
+        uploaded = await client.post(
+            upload_url,
+            headers={
+                "Content-Length": str(file_size),
+                "X-Goog-Upload-Offset": "0",
+                "X-Goog-Upload-Command": "upload, finalize",
+            },
+            content=media if in_memory else _stream_file(media),
+        )
+        uploaded.raise_for_status()
+        file_info = uploaded.json()["file"]
+        file_name = file_info["name"]
+        logger.info("File uploaded: %s", file_name)
+
+        try:
+            # Video files are processed server-side before they can be referenced
+            for _ in range(GEMINI_FILE_POLL_ATTEMPTS):
+                if file_info.get("state", "ACTIVE") != "PROCESSING":
+                    break
+                await asyncio.sleep(GEMINI_FILE_POLL_INTERVAL)
+                status_resp = await client.get(f"/v1beta/{file_name}")
+                status_resp.raise_for_status()
+                file_info = status_resp.json()
+            if file_info.get("state", "ACTIVE") != "ACTIVE":
+                raise ValueError("Gemini could not process this media file.")
+
+            prompt = (
+                "Transcribe the following audio/video file into a text transcript. "
+                "Format each line as 'Speaker: text'. If you cannot identify distinct speakers, "
+                "use 'Speaker 1', 'Speaker 2', etc. If only one speaker, use 'Speaker'. "
+                "Include all spoken content. Do NOT add commentary or analysis — only the transcript. "
+                "If the audio is unclear, do your best to transcribe what you hear."
+            )
 
-    logger.info("Uploading media file to Gemini for transcription...")
-    
-    # Upload file
-    uploaded = client.files.upload(file=file_path, config={'mime_type': mime_type})
-    logger.info("File uploaded: %s", uploaded.name)
-
-    prompt = (
-        "Transcribe the following audio/video file into a text transcript. "
-        "Format each line as 'Speaker: text'. If you cannot identify distinct speakers, "
-        "use 'Speaker 1', 'Speaker 2', etc. If only one speaker, use 'Speaker'. "
-        "Include all spoken content. Do NOT add commentary or analysis — only the transcript. "
-        "If the audio is unclear, do your best to transcribe what you hear."
-    )
+            response = await client.post(
+                f"/v1beta/models/{settings.gemini_model}:generateContent",
+                json={
+                    "contents": [{
+                        "parts": [
+                            {"file_data": {"mime_type": mime_type, "file_uri": file_info["uri"]}},
+                            {"text": prompt},
+                        ]
+                    }]
+                },
+            )
+            response.raise_for_status()
+            candidates = response.json().get("candidates") or []
+            parts = candidates[0].get("content", {}).get("parts", []) if candidates else []
+            transcript = "".join(part.get("text", "") for part in parts).strip()
+        finally:
+            # Clean up uploaded file off the critical path — subtitles don't wait on it
+            cleanup = asyncio.create_task(_delete_gemini_file(file_name))
+            _gemini_cleanups.add(cleanup)
+            cleanup.add_done_callback(_gemini_cleanups.discard)
 
-    response = client.models.generate_content(
-        model=settings.gemini_model,
-        contents=[uploaded, prompt]
-    )
-    transcript = (response.text or "").strip()
+    return transcript
+
+
+async def _process_media_upload(
+    meeting_id: int,
+    job_id: str,
+    user_id: int,
+    media: str | bytes,
+    content_type: str,
+    filename: str | None,
+    auto_analyze: bool,
+    media_hash: str,
+) -> None:
+    """Background job: transcribe the uploaded file and attach subtitles to the meeting."""
+    from sqlalchemy import update
+    from app.db.session import AsyncSessionLocal
+    from app.models.job import Job
+    from app.core.redis import get_cache, invalidate_cache, set_cache
 
-    # Clean up uploaded file
     try:
-        client.files.delete(name=uploaded.name)
-    except Exception:
-        pass
+        async with AsyncSessionLocal() as session:
+            await session.execute(update(Job).where(Job.id == job_id).values(status="processing", progress=10))
+            await session.commit()
+
+        # Identical media (same SHA-256) reuses the previous transcript
+        cache_key = f"transcript:{media_hash}"
+        transcript = await get_cache(cache_key)
+        if isinstance(transcript, str) and transcript:
+            logger.info("Transcript cache hit for meeting %d (%s)", meeting_id, media_hash[:12])
+        else:
+            transcript = await _transcribe_with_gemini_async(media, content_type)
+            if not transcript or len(transcript) < 10:
+                raise ValueError("Could not extract any transcript from this file.")
+            await set_cache(cache_key, transcript, ttl=TRANSCRIPT_CACHE_TTL)
+
+        async with AsyncSessionLocal() as session:
+            saved_count = await _insert_transcript_subtitles(session, meeting_id, transcript, confidence=0.85)
+            await session.execute(update(Job).where(Job.id == job_id).values(
+                status="completed", progress=100, result_id=meeting_id
+            ))
+            await session.commit()
+        logger.info(
+            "Created meeting %d from media upload (%s), %d subtitle lines",
+            meeting_id, filename, saved_count
+        )
+    except Exception as exc:
+        logger.error("Media transcription failed for meeting %d: %s", meeting_id, exc, exc_info=True)
+        async with AsyncSessionLocal() as session:
+            await session.execute(update(Job).where(Job.id == job_id).values(
+                status="failed", error=str(exc) if isinstance(exc, ValueError) else "Transcription failed. Please try again."
+            ))
+            # Drop the placeholder meeting created by upload_media so a failed
+            # upload leaves nothing behind (children go via ON DELETE CASCADE)
+            await session.execute(delete(Meeting).where(Meeting.id == meeting_id, Meeting.user_id == user_id))
+            await session.commit()
+        _transcript_cache.pop(meeting_id, None)
+        return
+    finally:
+        if isinstance(media, str):
+            await _remove_temp_file(media)
+        await invalidate_cache(f"user:{user_id}:")
 
-    return transcript
+    # Auto-analyze if requested. This already runs after the 202 went out, so
+    # the pipeline stays in-process rather than depending on a Celery worker
+    # (a missing broker would stall .delay() on connection retries).
+    if auto_analyze:
+        from app.tasks.ai_tasks import run_analysis_job
+
+        analysis_job_id = f"ai_job_{uuid.uuid4().hex[:8]}"
+        async with AsyncSessionLocal() as session:
+            session.add(Job(
+                id=analysis_job_id,
+                type="ai_analysis",
+                status="pending",
+                result_id=meeting_id
+            ))
+            await session.commit()
+
+        logger.info("Running auto-analysis for meeting %d", meeting_id)
+        await run_analysis_job(meeting_id, analysis_job_id)
+        await invalidate_cache(f"user:{user_id}:")
 
 
-@router.post("/upload-media", response_model=MeetingOut, status_code=status.HTTP_201_CREATED)
+@router.post("/upload-media", response_model=MediaUploadAccepted, status_code=status.HTTP_202_ACCEPTED)
 async def upload_media(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     title: str = Form(default=""),
     auto_analyze: bool = Form(default=False),
@@ -762,8 +1116,9 @@ async def upload_media(
     current_user: User = Depends(get_current_user),
 ):
     """
-    Upload a video or audio file → Gemini transcribes it → creates a meeting.
+    Upload a video or audio file → creates a meeting → Gemini transcribes it in the background.
     Supports: mp4, webm, mp3, wav, m4a, ogg (up to 100 MB).
+    Poll /ai/job-status/{job_id} until the transcription job completes.
     """
     # Validate file type
     content_type = file.content_type or ""
@@ -773,14 +1128,17 @@ async def upload_media(
             detail=f"Unsupported file type: {content_type}. Allowed: mp4, webm, mp3, wav, m4a, ogg"
         )
 
-    # Stream file to disk with size check to avoid loading large files in memory.
+    # Stream with a size check; small files stay in memory, larger ones spill to disk.
     ext = os.path.splitext(file.filename or "upload.mp4")[1] or ".mp4"
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=ext)
+    spool: list[bytes] = []
+    tmp_path: str | None = None
+    out = None
+    hasher = hashlib.sha256()
     total_size = 0
     first_chunk_checked = False
     try:
         while True:
-            chunk = await file.read(1024 * 1024)  # 1MB chunks
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
             if not chunk:
                 break
             if not first_chunk_checked:
@@ -793,174 +1151,168 @@ async def upload_media(
             total_size += len(chunk)
             if total_size > MAX_FILE_SIZE:
                 raise HTTPException(status_code=400, detail="File too large. Max 100 MB.")
-            tmp.write(chunk)
-
-        if total_size < 1000:
-            raise HTTPException(status_code=400, detail="File too small or empty.")
-
-        tmp.flush()
-        tmp.close()
-
-        # Transcribe in a thread (Gemini SDK is sync)
-        transcript = await asyncio.to_thread(
-            _transcribe_with_gemini, tmp.name, content_type
-        )
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error("Media transcription failed: %s", e, exc_info=True)
-        raise HTTPException(status_code=500, detail="Transcription failed. Please try again.")
-    finally:
-        try:
-            os.unlink(tmp.name)
-        except Exception:
-            pass
-
-    if not transcript or len(transcript) < 10:
-        raise HTTPException(status_code=400, detail="Could not extract any transcript from this file.")
-
-    # Create meeting with transcript
-    meeting_title = sanitize_input(title.strip()) if title.strip() else f"Media Upload ({file.filename})"
-    meeting = Meeting(
-        user_id=current_user.id,
-        title=meeting_title,
-        consent_given=True,
-    )
-    db.add(meeting)
-    await db.commit()
-    await db.refresh(meeting)
-
-    # Save transcript lines as subtitles
-    lines = transcript.split("\n")
-    current_time = 0.0
-    saved_count = 0
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        parts = line.split(":", 1)
-        if len(parts) == 2:
-            speaker = parts[0].strip()
-            text = parts[1].strip()
-        else:
-            speaker = "Speaker"
-            text = line
-        if not text:
-            continue
-
-        duration = max(2.0, len(text) / 15.0)
-        sub = Subtitle(
-            meeting_id=meeting.id,
-            speaker_id=speaker,
-            speaker_name=speaker,
-            text=text,
-            start_time=current_time,
-            end_time=current_time + duration,
-            confidence=0.85,
-        )
-        db.add(sub)
-        current_time += duration
-        saved_count += 1
+            hasher.update(chunk)
+
+            if out is None and total_size > MEDIA_SPOOL_MAX_SIZE:
+                fd, tmp_path = tempfile.mkstemp(suffix=ext)
+                os.close(fd)
+                out = await aiofiles.open(tmp_path, "wb")
+                await out.write(b"".join(spool))
+                spool.clear()
+            if out is None:
+                spool.append(chunk)
+            else:
+                await out.write(chunk)
 
-    await db.commit()
-    logger.info(
-        "Created meeting %d from media upload (%s), %d subtitle lines",
-        meeting.id, file.filename, saved_count
-    )
+        if out is not None:
+            await out.close()
+            out = None
 
-    # Auto-analyze if requested
-    if auto_analyze:
-        try:
-            from app.models.job import Job
-            from app.tasks.ai_tasks import analyze_meeting_background
-            
-            import uuid
-            job_id = f"ai_job_{uuid.uuid4().hex[:8]}"
-            new_job = Job(
-                id=job_id,
-                type="ai_analysis",
-                status="pending",
-                result_id=meeting.id
+        if total_size < MIN_FILE_SIZE:
+            raise HTTPException(status_code=400, detail="File too small or empty.")
+    except BaseException:
+        # Drop the partial file even when validation aborted mid-stream.
+        if out is not None:
+            await out.close()
+        if tmp_path:
+            await _remove_temp_file(tmp_path)
+        raise
+
+    # The spilled temp file is still ours until the background task takes it
+    try:
+        media = tmp_path or b"".join(spool)
+        media_hash = hasher.hexdigest()
+
+        # Create the meeting up front so the client gets an id immediately
+        from app.models.job import Job
+
+        meeting_title = sanitize_input(title.strip()) if title.strip() else f"Media Upload ({file.filename})"
+        meeting = (await db.scalars(
+            insert(Meeting)
+            .values(
+                user_id=current_user.id,
+                title=meeting_title,
+                consent_given=True,
+                media_hash=media_hash,
             )
-            db.add(new_job)
-            await db.commit()
+            .returning(Meeting)
+        )).one()
+
+        # Meeting and its tracking Job commit together: no meeting without a job
+        job_id = f"media_job_{uuid.uuid4().hex[:8]}"
+        db.add(Job(
+            id=job_id,
+            type="transcription",
+            status="pending",
+            result_id=meeting.id
+        ))
+        await db.commit()
 
-            analyze_meeting_background.delay(meeting.id, job_id)
-            logger.info("Queued auto-analysis for meeting %d", meeting.id)
-        except Exception as e:
-            logger.error("Auto-analysis failed to queue for meeting %d: %s", meeting.id, e)
+        background_tasks.add_task(
+            _process_media_upload,
+            meeting.id, job_id, current_user.id, media, content_type, file.filename, auto_analyze, media_hash,
+        )
+    except BaseException:
+        if tmp_path:
+            await _remove_temp_file(tmp_path)
+        raise
 
     from app.core.redis import invalidate_cache
     await invalidate_cache(f"user:{current_user.id}:")
-    return await _enrich_meeting(db, meeting, include_analysis=True)
+    return {
+        "id": meeting.id, "meeting_id": meeting.id, "title": meeting.title,
+        "job_id": job_id, "status": "processing",
+    }
 
 
 # ── Server-Served File Downloads ──────────────────────────
 # These serve files via HTTP response with Content-Disposition headers
 # so browsers treat them as regular downloads (not blocked by SmartScreen).
 
+_REPORT_DIVIDER = ("═" * 60).encode("utf-8")
+_REPORT_RULE = ("─" * 40).encode("utf-8")
+
+
+def _report_header(title: str) -> bytes:
+    return b"\n".join((_REPORT_RULE, title.encode("utf-8"), _REPORT_RULE))
+
+
+# Fixed report text, encoded once at import
+_HDR_SUMMARY = _report_header("📋 EXECUTIVE SUMMARY")
+_HDR_DECISIONS = _report_header("📌 DECISIONS")
+_HDR_ACTIONS = _report_header("📝 ACTION ITEMS")
+_HDR_RISKS = _report_header("⚠️ RISKS & CONCERNS")
+_HDR_SENTIMENT = _report_header("📊 SENTIMENT ANALYSIS")
+_HDR_TRANSCRIPT = _report_header("📄 TRANSCRIPT")
+_LBL_KEY_POINTS = "🔑 KEY POINTS:".encode("utf-8")
+_LBL_KEY_DECISIONS = "✅ KEY DECISIONS:".encode("utf-8")
+_REPORT_FOOTER = b"\n".join((_REPORT_DIVIDER, b"  Generated by MeetingAI Intelligence Platform", _REPORT_DIVIDER))
+
+
+def _item_text(item, *keys: str) -> str:
+    """Text of a report list entry: the string itself or the first non-empty key."""
+    if isinstance(item, str):
+        return item
+    for key in keys:
+        if item.get(key):
+            return item[key]
+    return str(item)
+
+
 @router.get("/{meeting_id}/download-report")
 async def download_report(
-    meeting_id: int,
+    meeting: Meeting = Depends(get_owned_meeting_or_token),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user_or_token),
 ):
     """Download a formatted meeting report as a .txt file."""
-    result = await db.execute(
-        select(Meeting).filter(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
-    )
-    meeting = result.scalar_one_or_none()
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Meeting not found")
-    transcript = await _reconstruct_transcript(db, meeting.id)
+    transcript_lines = await _transcript_lines(db, meeting.id)
 
     # Get analysis if it exists
     ai_result = (await db.execute(
         select(AIResult).where(AIResult.meeting_id == meeting.id).limit(1)
     )).scalar_one_or_none()
 
-    lines = []
-    divider = "═" * 60
+    # Report is assembled as pre-encoded UTF-8 fragments and joined once
+    parts: list[bytes] = []
+    add = parts.append
+
+    def line(text: str = "") -> None:
+        add(text.encode("utf-8"))
 
-    lines.append(divider)
-    lines.append(f"  MEETING REPORT: {meeting.title}")
-    lines.append(divider)
-    lines.append("")
-    lines.append(f"Date: {meeting.created_at}")
-    from datetime import datetime
-    lines.append(f"Report Generated: {datetime.now()}")
-    lines.append("")
+    add(_REPORT_DIVIDER)
+    line(f"  MEETING REPORT: {meeting.title}")
+    add(_REPORT_DIVIDER)
+    add(b"")
+    line(f"Date: {meeting.created_at}")
+    line(f"Report Generated: {datetime.now(timezone.utc).isoformat(timespec='seconds')}")
+    add(b"")
 
     if ai_result:
         # Summary from summary_json
         summary = ai_result.summary_json
         if summary:
-            lines.append("─" * 40)
-            lines.append("📋 EXECUTIVE SUMMARY")
-            lines.append("─" * 40)
+            add(_HDR_SUMMARY)
             if isinstance(summary, str):
-                lines.append(summary)
+                line(summary)
             elif isinstance(summary, dict):
                 text = summary.get("executive_summary") or summary.get("summary") or summary.get("text") or ""
                 if text:
-                    lines.append(text)
+                    line(text)
                 # Key points
                 key_points = summary.get("key_points") or summary.get("topics_discussed") or []
                 if key_points:
-                    lines.append("")
-                    lines.append("🔑 KEY POINTS:")
+                    add(b"")
+                    add(_LBL_KEY_POINTS)
                     for i, p in enumerate(key_points, 1):
-                        txt = p if isinstance(p, str) else (p.get("point") or p.get("text") or str(p))
-                        lines.append(f"  {i}. {txt}")
+                        line(f"  {i}. {_item_text(p, 'point', 'text')}")
                 # Decisions from summary
                 decisions = summary.get("key_decisions") or summary.get("decisions") or []
                 if decisions:
-                    lines.append("")
-                    lines.append("✅ KEY DECISIONS:")
+                    add(b"")
+                    add(_LBL_KEY_DECISIONS)
                     for i, d in enumerate(decisions, 1):
-                        txt = d if isinstance(d, str) else (d.get("decision") or d.get("text") or str(d))
-                        lines.append(f"  {i}. {txt}")
-            lines.append("")
+                        line(f"  {i}. {_item_text(d, 'decision', 'text')}")
+            add(b"")
 
         # Decisions from decisions_json
         decisions_data = ai_result.decisions_json
@@ -972,13 +1324,10 @@ async def download_report(
                         decs = v
                         break
             if decs:
-                lines.append("─" * 40)
-                lines.append("📌 DECISIONS")
-                lines.append("─" * 40)
+                add(_HDR_DECISIONS)
                 for i, d in enumerate(decs, 1):
-                    txt = d if isinstance(d, str) else (d.get("decision") or d.get("text") or str(d))
-                    lines.append(f"  {i}. {txt}")
-                lines.append("")
+                    line(f"  {i}. {_item_text(d, 'decision', 'text')}")
+                add(b"")
 
         # Actions from actions_json
         actions_data = ai_result.actions_json
@@ -990,19 +1339,15 @@ async def download_report(
                         acts = v
                         break
             if acts:
-                lines.append("─" * 40)
-                lines.append("📝 ACTION ITEMS")
-                lines.append("─" * 40)
+                add(_HDR_ACTIONS)
                 for i, a in enumerate(acts, 1):
-                    if isinstance(a, str):
-                        lines.append(f"  {i}. {a}")
-                    else:
-                        lines.append(f"  {i}. {a.get('action') or a.get('task') or a.get('text') or str(a)}")
+                    line(f"  {i}. {_item_text(a, 'action', 'task', 'text')}")
+                    if not isinstance(a, str):
                         if a.get("assignee"):
-                            lines.append(f"     Assigned to: {a['assignee']}")
+                            line(f"     Assigned to: {a['assignee']}")
                         if a.get("deadline") or a.get("due_date"):
-                            lines.append(f"     Deadline: {a.get('deadline') or a.get('due_date')}")
-                lines.append("")
+                            line(f"     Deadline: {a.get('deadline') or a.get('due_date')}")
+                add(b"")
 
         # Risks from risks_json
         risks_data = ai_result.risks_json
@@ -1014,42 +1359,33 @@ async def download_report(
                         rsks = v
                         break
             if rsks:
-                lines.append("─" * 40)
-                lines.append("⚠️ RISKS & CONCERNS")
-                lines.append("─" * 40)
+                add(_HDR_RISKS)
                 for i, r in enumerate(rsks, 1):
-                    txt = r if isinstance(r, str) else (r.get("risk") or r.get("text") or str(r))
-                    lines.append(f"  {i}. {txt}")
-                lines.append("")
+                    line(f"  {i}. {_item_text(r, 'risk', 'text')}")
+                add(b"")
 
         # Sentiment from sentiment_json
         sentiment = ai_result.sentiment_json
         if sentiment:
-            lines.append("─" * 40)
-            lines.append("📊 SENTIMENT ANALYSIS")
-            lines.append("─" * 40)
+            add(_HDR_SENTIMENT)
             if isinstance(sentiment, str):
-                lines.append(sentiment)
+                line(sentiment)
             elif isinstance(sentiment, dict):
                 if sentiment.get("overall"):
-                    lines.append(f"  Overall: {sentiment['overall']}")
+                    line(f"  Overall: {sentiment['overall']}")
                 if sentiment.get("tone"):
-                    lines.append(f"  Tone: {sentiment['tone']}")
-            lines.append("")
+                    line(f"  Tone: {sentiment['tone']}")
+            add(b"")
 
     # Transcript
-    if transcript:
-        lines.append("─" * 40)
-        lines.append("📄 TRANSCRIPT")
-        lines.append("─" * 40)
-        lines.append(transcript)
-        lines.append("")
-
-    lines.append(divider)
-    lines.append("  Generated by MeetingAI Intelligence Platform")
-    lines.append(divider)
-
-    content = "\n".join(lines)
+    if transcript_lines:
+        add(_HDR_TRANSCRIPT)
+        parts.extend(text.encode("utf-8") for text in transcript_lines)
+        add(b"")
+
+    add(_REPORT_FOOTER)
+
+    content = b"\n".join(parts)
     filename = _build_meeting_filename(meeting.title, "report")
 
     return Response(
@@ -1062,28 +1398,63 @@ async def download_report(
     )
 
 
+TRANSCRIPT_STREAM_BATCH = 500
+
+
+async def _stream_transcript(meeting_id: int, offset: int = 0, limit: int | None = None):
+    """Yield the transcript (optionally one page of lines) as UTF-8 in batches of subtitle rows.
+
+    Runs on its own session because the body is sent after the request's
+    dependencies have finished.
+    """
+    from app.db.session import AsyncSessionLocal
+
+    stmt = (
+        select(Subtitle.speaker_name, Subtitle.speaker_id, Subtitle.text)
+        .where(Subtitle.meeting_id == meeting_id)
+        # id breaks start_time ties so OFFSET pages never overlap
+        .order_by(Subtitle.start_time, Subtitle.id)
+        .offset(offset)
+        .limit(limit)
+        .execution_options(yield_per=TRANSCRIPT_STREAM_BATCH)
+    )
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(stmt)
+        prefix = ""
+        async for rows in result.partitions():
+            chunk = "\n".join(f"{name or speaker_id}: {text}" for name, speaker_id, text in rows)
+            yield (prefix + chunk).encode("utf-8")
+            prefix = "\n"
+
+
+@router.get("/{meeting_id}/transcript")
+async def get_transcript(
+    offset: int = Query(0, ge=0, description="Number of transcript lines to skip"),
+    limit: int | None = Query(None, ge=1, le=10_000, description="Maximum lines to return (default: all)"),
+    meeting: Meeting = Depends(get_owned_meeting),
+):
+    """Stream transcript lines as plain text, optionally one OFFSET/LIMIT page at a time."""
+    return StreamingResponse(
+        _stream_transcript(meeting.id, offset, limit),
+        media_type="text/plain; charset=utf-8",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @router.get("/{meeting_id}/download-transcript")
 async def download_transcript(
-    meeting_id: int,
+    meeting: Meeting = Depends(get_owned_meeting_or_token),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user_or_token),
 ):
-    """Download the raw transcript as a .txt file."""
-    result = await db.execute(
-        select(Meeting).filter(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
-    )
-    meeting = result.scalar_one_or_none()
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Meeting not found")
-    transcript = await _reconstruct_transcript(db, meeting.id)
-
-    if not transcript:
+    """Download the raw transcript as a .txt file (streamed, constant memory)."""
+    has_lines = await db.scalar(select(select(Subtitle.id).where(Subtitle.meeting_id == meeting.id).exists()))
+    if not has_lines:
         raise HTTPException(status_code=404, detail="No transcript available for this meeting")
 
     filename = _build_meeting_filename(meeting.title, "transcript")
 
-    return Response(
-        content=transcript,
+    return StreamingResponse(
+        _stream_transcript(meeting.id),
         media_type="text/plain",
         headers={
             "Content-Disposition": _content_disposition(filename),
@@ -4,42 +4,507 @@ Live Meeting WebSocket — Real-time audio processing + broadcast
 Handles:
   - WebSocket authentication via query param token
   - Participant join/leave lifecycle
-  - Audio chunk processing (Whisper + Pyannote)
+  - Audio chunk processing (Whisper + Pyannote), sent as binary frames
   - Subtitle broadcast to all connected clients
   - Participant count updates
 """
 import asyncio
-import base64
-import json
 import logging
-from datetime import datetime
-
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, status
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.db.session import get_db
-from app.core.socket_manager import manager
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import orjson
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from sqlalchemy import insert, lambda_stmt, select, update
+
+from app.db.session import AsyncSessionLocal
+from app.core.socket_manager import SEND_TIMEOUT, manager
 from app.models.participant import Participant
 from app.models.meeting import Meeting
+from app.models.chat_message import ChatMessage
 from app.models.subtitle import Subtitle
 from app.models.user import User
-from app.core.security import decode_token, sanitize_input
-from app.core.token_revocation import is_jti_revoked
-# Lazy import for speech processor to avoid heavy load at startup
-from app.ai.speech_service import get_speech_processor
+from app.core.security import decode_token_cached, sanitize_input
+from app.core.token_revocation import is_jti_revoked_cached
+# Models load inside the speech worker processes, not at import
+from app.ai.speech_service import transcribe_chunk
 
 router = APIRouter()
 logger = logging.getLogger("meetingai.ws.meeting")
 
 
+@lru_cache(maxsize=1)
+def _iso_second(second: int) -> str:
+    return datetime.fromtimestamp(second, timezone.utc).isoformat()
+
+
+def _iso_now() -> str:
+    """UTC ISO timestamp for broadcast payloads, formatted once per second."""
+    return _iso_second(int(time.time()))
+
+
+# Roles allowed to run ADMIN_ACTION events
+_ADMIN_ROLES = frozenset({'host', 'presenter'})
+
+# Shared-note edits arrive once per keystroke, each carrying the full text
+NOTE_UPDATE_DEBOUNCE = 0.03  # seconds; only the latest edit in the window is broadcast
+
+
+# ── Live write-behind queue ───────────────────────────────
+# Subtitles and chat messages from every live meeting go through one queue. A
+# single writer task inserts them in batches (one executemany per table + one
+# commit per batch). Rows are broadcast only once they are saved, so clients
+# never see a message that was lost; subtitles also need their database id.
+LIVE_WRITE_BATCH_SIZE = 100
+LIVE_WRITE_FLUSH_INTERVAL = 0.2  # seconds a batch may wait to fill up
+
+_write_queue: asyncio.Queue | None = None
+_live_writer: asyncio.Task | None = None
+
+
+def _queue_row(model, row: dict, message: dict | None = None) -> None:
+    """Hand a row (and its pending broadcast) to the batch writer."""
+    global _write_queue, _live_writer
+    if (
+        _live_writer is None
+        or _live_writer.done()
+        or _live_writer.get_loop() is not asyncio.get_running_loop()
+    ):
+        _write_queue = asyncio.Queue()
+        _live_writer = asyncio.create_task(_write_rows(_write_queue))
+    _write_queue.put_nowait((model, row, message))
+
+
+async def _insert_rows(batch: list[tuple]) -> list[int]:
+    """Save one batch in a single transaction; returns the new subtitle ids in order."""
+    subtitles = [row for model, row, _ in batch if model is Subtitle]
+    chats = [row for model, row, _ in batch if model is ChatMessage]
+    ids = []
+    async with AsyncSessionLocal() as session:
+        if subtitles:
+            ids = (await session.scalars(
+                insert(Subtitle).returning(Subtitle.id, sort_by_parameter_order=True), subtitles
+            )).all()
+            # Bulk inserts skip the ORM listeners that maintain meetings.subtitle_count
+            for meeting_id, count in Counter(row["meeting_id"] for row in subtitles).items():
+                await session.execute(
+                    update(Meeting)
+                    .where(Meeting.id == meeting_id)
+                    .values(subtitle_count=Meeting.subtitle_count + count)
+                    .execution_options(synchronize_session=False)
+                )
+        if chats:
+            await session.execute(insert(ChatMessage), chats)
+        await session.commit()
+    return ids
+
+
+async def _flush_rows(batch: list[tuple]) -> None:
+    try:
+        saved = [(batch, await _insert_rows(batch))]
+    except Exception as exc:
+        # One bad row (e.g. its meeting was deleted mid-session) fails the
+        # whole executemany. The session rolled back, so retry meeting by
+        # meeting: only the failing meeting loses its rows.
+        logger.warning("Saving %d live meeting rows failed (%s); retrying per meeting", len(batch), exc)
+        by_meeting: dict[int, list[tuple]] = {}
+        for item in batch:
+            by_meeting.setdefault(item[1]["meeting_id"], []).append(item)
+        saved = []
+        for meeting_id, items in by_meeting.items():
+            try:
+                saved.append((items, await _insert_rows(items)))
+            except Exception as meeting_exc:
+                logger.error(
+                    "Dropping %d live rows for meeting %d: %s", len(items), meeting_id, meeting_exc
+                )
+
+    for items, ids in saved:
+        subtitle_ids = iter(ids)
+        for model, row, message in items:
+            if model is Subtitle:
+                message["id"] = next(subtitle_ids)
+            if message is not None:
+                await manager.broadcast(row["meeting_id"], message)
+
+
+async def _write_rows(queue: asyncio.Queue) -> None:
+    """Drain the queue in batches of up to LIVE_WRITE_BATCH_SIZE or LIVE_WRITE_FLUSH_INTERVAL.
+
+    A None item stops the writer once everything queued before it is saved.
+    """
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        item = await queue.get()
+        if item is None:
+            break
+        batch = [item]
+        deadline = loop.time() + LIVE_WRITE_FLUSH_INTERVAL
+        while len(batch) < LIVE_WRITE_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+
+        try:
+            await _flush_rows(batch)
+        except Exception as exc:
+            logger.error("Saving %d live meeting rows failed: %s", len(batch), exc)
+
+
+async def stop_live_writer() -> None:
+    """Flush queued subtitles/chat messages and stop the writer (app shutdown)."""
+    if _live_writer is None or _live_writer.done():
+        return
+    _write_queue.put_nowait(None)
+    await _live_writer
+
+
+async def _process_audio_chunk(meeting_id: int, audio_bytes: bytes) -> None:
+    """Transcribe one audio chunk and queue the resulting subtitle."""
+    # Inference runs in the speech worker pool, off this process's GIL
+    result = await transcribe_chunk(audio_bytes)
+    if not result:
+        return
+
+    # Speech-to-text output is generally safe from XSS, but let's be safe
+    clean_text = sanitize_input(result.get("text", ""))
+    speaker = result.get("speaker", "Speaker")
+    start = result.get("start_offset", 0.0)
+    end = result.get("end_offset", 0.0)
+
+    # Saved in the next batch, then broadcast with its id
+    _queue_row(Subtitle, {
+        "meeting_id": meeting_id,
+        "speaker_id": speaker,
+        "speaker_name": speaker,
+        "text": clean_text,
+        "start_time": start,
+        "end_time": end,
+        "confidence": result.get("confidence", 1.0),
+    }, {
+        "type": "SUBTITLE",
+        "id": None,
+        "text": clean_text,
+        "speaker": speaker,
+        "start": start,
+        "end": end,
+        "timestamp": _iso_now(),
+    })
+
+
+# ── Live event handlers ───────────────────────────────────
+# One coroutine per client event type, dispatched through _EVENT_HANDLERS.
+@dataclass
+class _LiveContext:
+    """Per-connection state shared by the event handlers."""
+    websocket: WebSocket
+    meeting_id: int
+    user_id: int
+    # The manager's roles dict for this meeting (SET_ROLE mutates it in place)
+    roles: dict
+    pending_note: dict = field(default_factory=dict)
+
+    @property
+    def role(self) -> str:
+        return self.roles.get(self.user_id, 'viewer')
+
+
+async def _on_admin_update(ctx: _LiveContext, event: dict) -> None:
+    if ctx.role != 'host':
+        return
+    # Update meeting settings (stored in-memory via manager)
+    manager.update_settings(ctx.meeting_id, event.get("settings", {}))
+    await manager.broadcast(ctx.meeting_id, {
+        "type": "SETTINGS_UPDATE",
+        "settings": manager.get_settings(ctx.meeting_id)
+    })
+
+
+async def _kick_socket(websocket: WebSocket, kick_msg: dict) -> None:
+    await manager.send_personal(websocket, kick_msg)
+    await websocket.close()
+
+
+async def _on_admin_action(ctx: _LiveContext, event: dict) -> None:
+    user_role = ctx.role
+    if user_role not in _ADMIN_ROLES:
+        return
+    meeting_id = ctx.meeting_id
+    action = event.get("action")
+    target_id = event.get("target_id")
+
+    if action == "KICK":
+        # user_connections maps user -> socket, so the kick is enforced
+        # server-side instead of trusting the target's client to leave
+        kick_msg = {"type": "KICK_USER", "target_id": target_id}
+        target_ws = manager.get_socket(meeting_id, target_id)
+        if target_ws is not None and target_ws is not ctx.websocket:
+            # Stop the target's writer first so the direct send below doesn't
+            # race it; the socket is closed before its queue would drain
+            manager.disconnect(target_ws, meeting_id, target_id)
+            try:
+                # Bounded: an unresponsive target must not stall the host's loop
+                await asyncio.wait_for(_kick_socket(target_ws, kick_msg), SEND_TIMEOUT)
+            except Exception:
+                pass
+        await manager.broadcast(meeting_id, kick_msg)
+
+    elif action == "SET_ROLE" and user_role == 'host':
+        new_role = event.get("role")
+        manager.set_role(meeting_id, target_id, new_role)
+        await manager.broadcast(meeting_id, {
+            "type": "ROLE_UPDATE",
+            "user_id": target_id,
+            "role": new_role
+        })
+
+    elif action == "ADMIT" and user_role == 'host':
+        # Handle Waiting Room Admission
+        pending = manager.waiting_room.get(meeting_id, {})
+        ws_waiting = next((ws for ws, (u_id, _) in pending.items() if u_id == target_id), None)
+        if ws_waiting is not None:
+            _, w_event = pending.pop(ws_waiting)
+            await ws_waiting.send_json({"type": "ADMITTED"})
+            w_event.set() # Unblocks the other task
+
+
+async def _on_qa_ask(ctx: _LiveContext, event: dict) -> None:
+    # Broadcast new question
+    text = sanitize_input(event.get("text"))
+    if text:
+        await manager.broadcast(ctx.meeting_id, {
+            "type": "QA_ASK",
+            "id": event.get("id"),
+            "text": text,
+            "sender": "Anonymous" if event.get("anonymous") else event.get("sender", "User"),
+            "timestamp": _iso_now(),
+            "upvotes": 0
+        })
+
+
+async def _on_qa_upvote(ctx: _LiveContext, event: dict) -> None:
+    await manager.broadcast(ctx.meeting_id, {
+        "type": "QA_UPVOTE",
+        "question_id": event.get("question_id"),
+        "user_id": ctx.user_id
+    })
+
+
+async def _on_qa_delete(ctx: _LiveContext, event: dict) -> None:
+    if ctx.role in _ADMIN_ROLES: # Only admins can delete/resolve
+        await manager.broadcast(ctx.meeting_id, {
+            "type": "QA_DELETE",
+            "question_id": event.get("question_id")
+        })
+
+
+async def _on_feedback(ctx: _LiveContext, event: dict) -> None:
+    comment = sanitize_input(event.get("comment"))
+    await manager.broadcast(ctx.meeting_id, {
+        "type": "FEEDBACK",
+        "rating": event.get("rating"),
+        "comment": comment,
+        "timestamp": _iso_now(),
+        "for_role": "host"
+    })
+
+
+async def _on_transcription(ctx: _LiveContext, event: dict) -> None:
+    # Browser-based transcription (Web Speech API)
+    text = sanitize_input(event.get("text", "").strip())
+    speaker = sanitize_input(event.get("speaker", "Speaker"))
+    confidence = event.get("confidence", 0.9)
+
+    if text:
+        # Saved in the next batch, then broadcast to all participants
+        _queue_row(Subtitle, {
+            "meeting_id": ctx.meeting_id,
+            "speaker_id": str(ctx.user_id),
+            "speaker_name": speaker,
+            "text": text,
+            "start_time": 0.0,
+            "end_time": 0.0,
+            "confidence": confidence,
+        }, {
+            "type": "SUBTITLE",
+            "id": None,
+            "text": text,
+            "speaker": speaker,
+            "confidence": confidence,
+            "timestamp": _iso_now(),
+        })
+        logger.debug("Queued transcription: %s", text[:60])
+
+
+async def _on_ping(ctx: _LiveContext, event: dict) -> None:
+    manager.send_queued(ctx.websocket, {"type": "PONG"})
+
+
+async def _on_chat(ctx: _LiveContext, event: dict) -> None:
+    chat_text = sanitize_input(event.get("text", ""))
+    sender_name = event.get("sender", "Anonymous")
+
+    if chat_text:
+        # Saved in the next write batch, then broadcast
+        _queue_row(ChatMessage, {
+            "meeting_id": ctx.meeting_id,
+            "sender_name": sender_name,
+            "sender_id": ctx.user_id,
+            "message": chat_text,
+            "timestamp": datetime.utcnow(),
+        }, {
+            "type": "CHAT",
+            "sender": sender_name,
+            "text": chat_text,
+            "timestamp": _iso_now(),
+        })
+
+
+async def _on_reaction(ctx: _LiveContext, event: dict) -> None:
+    await manager.broadcast(ctx.meeting_id, {
+        "type": "REACTION",
+        "emoji": event.get("emoji", "👍"),
+        "sender": event.get("sender", "Anonymous"),
+        "timestamp": _iso_now(),
+    })
+
+
+async def _on_hand_raise(ctx: _LiveContext, event: dict) -> None:
+    await manager.broadcast(ctx.meeting_id, {
+        "type": "HAND_RAISE",
+        "user_id": ctx.user_id,
+        "is_raised": event.get("is_raised", True),
+        "timestamp": _iso_now(),
+    })
+
+
+async def _on_confetti(ctx: _LiveContext, event: dict) -> None:
+    await manager.broadcast(ctx.meeting_id, {
+        "type": "CONFETTI",
+        "timestamp": _iso_now(),
+    })
+
+
+async def _on_poll_create(ctx: _LiveContext, event: dict) -> None:
+    # Sanitize question and options
+    question = sanitize_input(event.get("question"))
+    options = [sanitize_input(opt) for opt in event.get("options", [])]
+
+    if question and options:
+        await manager.broadcast(ctx.meeting_id, {
+            "type": "POLL_CREATE",
+            "question": question,
+            "options": options,
+            "sender": event.get("sender", "Host"),
+            "timestamp": _iso_now(),
+        })
+
+
+async def _on_poll_vote(ctx: _LiveContext, event: dict) -> None:
+    await manager.broadcast(ctx.meeting_id, {
+        "type": "POLL_VOTE",
+        "option_index": event.get("option_index"),
+        "user_id": ctx.user_id,
+        "timestamp": _iso_now(),
+    })
+
+
+async def _on_signal(ctx: _LiveContext, event: dict) -> None:
+    # WebRTC signalling goes to one peer only
+    target_ws = manager.get_socket(ctx.meeting_id, event.get("target"))
+    if target_ws:
+        # Queued: stays in order with broadcasts and never races the writer
+        manager.send_queued(target_ws, {
+            "type": "signal",
+            "sender": ctx.user_id,
+            "payload": event.get("payload")
+        })
+
+
+async def _on_whiteboard(ctx: _LiveContext, event: dict) -> None:
+    # Broadcast whiteboard actions to all EXCEPT sender
+    wb_msg = {
+        "type": "WHITEBOARD",
+        "action": event.get("action"),
+        "data": event.get("data"),
+        "sender": ctx.user_id
+    }
+    await manager.broadcast(ctx.meeting_id, wb_msg, exclude=ctx.websocket)
+
+
+# Strong refs so debounced note broadcasts are not garbage-collected mid-flight
+_note_broadcasts: set[asyncio.Task] = set()
+
+
+def _note_broadcast_done(task: asyncio.Task) -> None:
+    _note_broadcasts.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Shared note broadcast failed: %s", task.exception())
+
+
+def _flush_note(ctx: _LiveContext) -> None:
+    note_msg = ctx.pending_note.pop("message", None)
+    if note_msg is not None:
+        broadcast = asyncio.create_task(manager.broadcast(ctx.meeting_id, note_msg))
+        _note_broadcasts.add(broadcast)
+        broadcast.add_done_callback(_note_broadcast_done)
+
+
+async def _on_note_update(ctx: _LiveContext, event: dict) -> None:
+    # Broadcast shared note changes, latest text wins within the debounce window
+    if "message" not in ctx.pending_note:
+        asyncio.get_running_loop().call_later(NOTE_UPDATE_DEBOUNCE, _flush_note, ctx)
+    ctx.pending_note["message"] = {
+        "type": "NOTE_UPDATE",
+        "noteText": event.get("noteText"),
+        "sender": ctx.user_id
+    }
+
+
+_EVENT_HANDLERS = {
+    "ADMIN_UPDATE": _on_admin_update,
+    "ADMIN_ACTION": _on_admin_action,
+    "QA_ASK": _on_qa_ask,
+    "QA_UPVOTE": _on_qa_upvote,
+    "QA_DELETE": _on_qa_delete,
+    "FEEDBACK": _on_feedback,
+    "TRANSCRIPTION": _on_transcription,
+    "SUBTITLE": _on_transcription,
+    "PING": _on_ping,
+    "CHAT": _on_chat,
+    "REACTION": _on_reaction,
+    "HAND_RAISE": _on_hand_raise,
+    "CONFETTI": _on_confetti,
+    "POLL_CREATE": _on_poll_create,
+    "POLL_VOTE": _on_poll_vote,
+    "signal": _on_signal,
+    "WHITEBOARD": _on_whiteboard,
+    "NOTE_UPDATE": _on_note_update,
+}
+
+
 @router.websocket("/ws/meeting/{meeting_id}")
 async def websocket_endpoint(
     websocket: WebSocket, 
     meeting_id: int, 
-    db: AsyncSession = Depends(get_db)
 ):
-    """WebSocket endpoint for live meeting participation."""
+    """WebSocket endpoint for live meeting participation.
+
+    A socket can stay open for hours, so it does not hold a pooled DB
+    connection: each database step opens a short-lived session instead.
+    """
 
     # ── 1. Authenticate via query param ───────────────
     token = websocket.query_params.get("token")
@@ -57,9 +522,12 @@ async def websocket_endpoint(
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
             return
 
-        # Decode token (CPU bound, but fast enough)
-        payload = decode_token(token)
-        if await is_jti_revoked(db, payload.get("jti")):
+        # Clients reconnect with the same token, so the signature check and
+        # a "not revoked" answer are reused across connections
+        payload = decode_token_cached(token)
+        async with AsyncSessionLocal() as db:
+            revoked = await is_jti_revoked_cached(db, payload.get("jti"))
+        if revoked:
             raise ValueError("Token has been revoked")
         user_id = int(payload.get("sub"))
         
@@ -72,10 +540,17 @@ async def websocket_endpoint(
         return
 
     # ── 2. Validate meeting exists ────────────────────
-    result = await db.execute(select(Meeting).filter(Meeting.id == meeting_id))
-    meeting = result.scalar_one_or_none()
-    
-    if not meeting:
+    # Only the host id is needed for the rest of the connection, so read that
+    # column instead of holding an ORM row across the session's commits.
+    # lambda_stmt: these run on every connect, so they are built and compiled once
+    async with AsyncSessionLocal() as db:
+        host_user_id = await db.scalar(lambda_stmt(lambda: select(Meeting.user_id).where(Meeting.id == meeting_id)))
+        # Display name is looked up once and kept by the manager for participant lists
+        user_row = (await db.execute(lambda_stmt(
+            lambda: select(User.full_name, User.email).where(User.id == user_id)
+        ))).first()
+
+    if host_user_id is None:
         logger.warning("WebSocket: meeting %d not found", meeting_id)
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
@@ -90,7 +565,7 @@ async def websocket_endpoint(
         await websocket.close()
         return
 
-    is_creator = (meeting.user_id == user_id)
+    is_creator = (host_user_id == user_id)
     # user_id is the host/creator of the meeting
     
     # Set initial role
@@ -112,42 +587,37 @@ async def websocket_endpoint(
         
         # Store in waiting list with an event to unblock
         wait_event = asyncio.Event()
-        if meeting_id not in manager.waiting_room: manager.waiting_room[meeting_id] = []
-        manager.waiting_room[meeting_id].append((websocket, user_id, wait_event))
+        manager.waiting_room.setdefault(meeting_id, {})[websocket] = (user_id, wait_event)
         
         # Wait until admitted
         try:
             await wait_event.wait()
         except Exception:
             # Client disconnected while waiting
-            if meeting_id in manager.waiting_room:
-                 manager.waiting_room[meeting_id] = [u for u in manager.waiting_room[meeting_id] if u[0] != websocket]
+            manager.waiting_room.get(meeting_id, {}).pop(websocket, None)
             return
 
-    await manager.connect(websocket, meeting_id, user_id)
+    await manager.connect(websocket, meeting_id, user_id, (user_row.full_name or user_row.email) if user_row else None)
 
     logger.info("User %d joined meeting %d as %s", user_id, meeting_id, role)
 
+    ctx = _LiveContext(websocket, meeting_id, user_id, manager.roles.setdefault(meeting_id, {}))
+
     try:
         # ── 4. Register participant ───────────────────
-        res = await db.execute(select(Participant).filter(
-            Participant.meeting_id == meeting_id,
-            Participant.user_id == user_id,
-        ))
-        participant = res.scalars().first()
-
-        if not participant:
-            participant = Participant(
-                meeting_id=meeting_id,
-                user_id=user_id,
-                join_time=datetime.utcnow(),
-            )
-            db.add(participant)
-        else:
-            participant.join_time = datetime.utcnow()
-            participant.leave_time = None
-
-        await db.commit()
+        # Rejoin is a single UPDATE; only a first join needs the INSERT
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            rejoined = await db.execute(lambda_stmt(
+                lambda: update(Participant)
+                .where(Participant.meeting_id == meeting_id, Participant.user_id == user_id)
+                .values(join_time=now, leave_time=None)
+            ))
+            if rejoined.rowcount == 0:
+                await db.execute(lambda_stmt(
+                    lambda: insert(Participant).values(meeting_id=meeting_id, user_id=user_id, join_time=now)
+                ))
+            await db.commit()
 
         # Broadcast join + participant count + settings
         await manager.broadcast(meeting_id, {
@@ -156,328 +626,45 @@ async def websocket_endpoint(
             "role": role,
             "settings": manager.get_settings(meeting_id),
             "participant_count": manager.get_participant_count(meeting_id),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _iso_now(),
         })
 
-        # Broadcast participant list update
-        # 1. Get active user IDs
-        active_ids = list(manager.user_connections.get(meeting_id, {}).keys())
-        # 2. Query users
-        if active_ids:
-            u_stmt = select(User).filter(User.id.in_(active_ids))
-            u_res = await db.execute(u_stmt)
-            users = u_res.scalars().all()
-            
-            p_List = []
-            for u in users:
-                p_role = manager.get_role(meeting_id, u.id)
-                p_List.append({
-                    "id": u.id,
-                    "name": u.full_name or u.email,
-                    "role": p_role,
-                    "avatar": None # Placeholder
-                })
-            
-            await manager.broadcast(meeting_id, {
-                "type": "participants",
-                "participants": p_List
-            })
+        # Full roster for the newcomer only; everyone else gets a one-entry delta
+        manager.send_queued(websocket, {
+            "type": "participants",
+            "participants": manager.get_participants(meeting_id),
+        })
+        await manager.broadcast(meeting_id, {
+            "type": "participants_delta",
+            "add": [manager.get_participant(meeting_id, user_id)],
+        }, exclude=websocket)
 
         # ── 5. Event Loop ────────────────────────────
         while True:
-            data = await websocket.receive_text()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+
+            # Binary frames are raw audio chunks: no JSON envelope, no base64
+            if message.get("bytes") is not None:
+                try:
+                    await _process_audio_chunk(meeting_id, message["bytes"])
+                except Exception as audio_err:
+                    logger.error("Audio processing failed: %s", audio_err)
+                continue
+
+            data = message.get("text") or ""
             try:
-                event = json.loads(data)
+                event = orjson.loads(data)
                 event_type = event.get("type")
-                
-                # Check permissions for admin actions
-                user_role = manager.get_role(meeting_id, user_id)
-                is_admin = user_role in ['host', 'presenter']
-
-                if event_type == "ADMIN_UPDATE" and user_role == 'host':
-                    # Update meeting settings (stored in-memory via manager)
-                    updates = event.get("settings", {})
-                    manager.update_settings(meeting_id, updates)
-                    
-                    await manager.broadcast(meeting_id, {
-                        "type": "SETTINGS_UPDATE",
-                        "settings": manager.get_settings(meeting_id)
-                    })
-
-                elif event_type == "ADMIN_ACTION" and is_admin:
-                    action = event.get("action")
-                    target_id = event.get("target_id")
-                    
-                    if action == "KICK":
-                         # Find target websocket
-                         target_ws = None
-                         for ws in manager.active_connections.get(meeting_id, []):
-                             # We need a way to map WS to ID, for now manager just has list
-                             # This implementation limitation requires mapping. 
-                             # Assuming we can't easily find WS by ID without mapping.
-                             pass 
-                         # For this prototype, broadcast KICK event and client handles disconnect?
-                         # Better: Server forces disconnect?
-                         # Let's use broadcast "KICK" and client auto-leaves if it matches them
-                         await manager.broadcast(meeting_id, {
-                             "type": "KICK_USER",
-                             "target_id": target_id
-                         })
-                         
-                    elif action == "SET_ROLE" and user_role == 'host':
-                        new_role = event.get("role")
-                        manager.set_role(meeting_id, target_id, new_role)
-                        await manager.broadcast(meeting_id, {
-                            "type": "ROLE_UPDATE",
-                            "user_id": target_id,
-                            "role": new_role
-                        })
-                        
-                    elif action == "ADMIT" and user_role == 'host':
-                        # Handle Waiting Room Admission
-                        pending = manager.waiting_room.get(meeting_id, [])
-                        found = next((u for u in pending if u[1] == target_id), None)
-                        if found:
-                            ws_waiting, u_id, w_event = found
-                            await ws_waiting.send_json({"type": "ADMITTED"})
-                            w_event.set() # Unblocks the other task
-                            manager.waiting_room[meeting_id].remove(found)
-
-                elif event_type == "QA_ASK":
-                    # Broadcast new question
-                    text = sanitize_input(event.get("text"))
-                    if text:
-                        await manager.broadcast(meeting_id, {
-                            "type": "QA_ASK",
-                            "id": event.get("id"),
-                            "text": text,
-                            "sender": "Anonymous" if event.get("anonymous") else event.get("sender", "User"),
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "upvotes": 0
-                        })
-
-                elif event_type == "QA_UPVOTE":
-                    # Broadcast upvote
-                    await manager.broadcast(meeting_id, {
-                        "type": "QA_UPVOTE",
-                        "question_id": event.get("question_id"),
-                        "user_id": user_id
-                    })
-                
-                elif event_type == "QA_DELETE":
-                    if is_admin: # Only admins can delete/resolve
-                        await manager.broadcast(meeting_id, {
-                            "type": "QA_DELETE",
-                            "question_id": event.get("question_id")
-                        })
-
-                elif event_type == "FEEDBACK":
-                    # ... [No change needed here for MVP security, but could sanitize comment]
-                    comment = sanitize_input(event.get("comment"))
-                    hosts = [uid for uid, r in manager.roles.get(meeting_id, {}).items() if r == 'host']
-                    await manager.broadcast(meeting_id, {
-                        "type": "FEEDBACK",
-                        "rating": event.get("rating"),
-                        "comment": comment,
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "for_role": "host" 
-                    })
-
-                elif event_type == "AUDIO_CHUNK":
-                    # ... [Binary data doesn't need HTML sanitization]
-                    audio_b64 = event.get("data")
-                    if audio_b64:
-                        try:
-                            audio_bytes = base64.b64decode(audio_b64)
-                            processor = get_speech_processor()
-                            
-                            if processor:
-                                # Offload heavy speech processing
-                                result = await asyncio.to_thread(processor.process_chunk, audio_bytes)
-
-                                if result:
-                                    # Save subtitle asynchronously
-                                    # Note: Speech-to-text output is generally safe from XSS, but let's be safe
-                                    clean_text = sanitize_input(result.get("text", ""))
-                                    new_subtitle = Subtitle(
-                                        meeting_id=meeting_id,
-                                        speaker_id=result.get("speaker", "Speaker"),
-                                        speaker_name=result.get("speaker", "Speaker"),
-                                        text=clean_text,
-                                        start_time=result.get("start_offset", 0.0),
-                                        end_time=result.get("end_offset", 0.0),
-                                        confidence=result.get("confidence", 1.0),
-                                    )
-                                    db.add(new_subtitle)
-                                    await db.commit()
-                                    await db.refresh(new_subtitle)
-
-                                    # Broadcast subtitle
-                                    await manager.broadcast(meeting_id, {
-                                        "type": "SUBTITLE",
-                                        "id": new_subtitle.id,
-                                        "text": new_subtitle.text,
-                                        "speaker": new_subtitle.speaker_name,
-                                        "start": new_subtitle.start_time,
-                                        "end": new_subtitle.end_time,
-                                        "timestamp": datetime.utcnow().isoformat(),
-                                    })
-                        except Exception as audio_err:
-                            logger.error("Audio processing failed: %s", audio_err)
-
-                # ── Browser-based transcription (Web Speech API) ──
-                elif event_type in {"TRANSCRIPTION", "SUBTITLE"}:
-                    text = sanitize_input(event.get("text", "").strip())
-                    speaker = sanitize_input(event.get("speaker", "Speaker"))
-                    confidence = event.get("confidence", 0.9)
-                    
-                    if text:
-                        try:
-                            # Save subtitle to DB
-                            new_subtitle = Subtitle(
-                                meeting_id=meeting_id,
-                                speaker_id=str(user_id),
-                                speaker_name=speaker,
-                                text=text,
-                                start_time=0.0,
-                                end_time=0.0,
-                                confidence=confidence,
-                            )
-                            db.add(new_subtitle)
-                            await db.commit()
-                            await db.refresh(new_subtitle)
-
-                            # Broadcast to all participants
-                            await manager.broadcast(meeting_id, {
-                                "type": "SUBTITLE",
-                                "id": new_subtitle.id,
-                                "text": new_subtitle.text,
-                                "speaker": new_subtitle.speaker_name,
-                                "confidence": confidence,
-                                "timestamp": datetime.utcnow().isoformat(),
-                            })
-                            logger.debug("Saved transcription: %s", text[:60])
-                        except Exception as t_err:
-                            logger.error("Transcription save failed: %s", t_err)
-
-                elif event_type == "PING":
-                    await manager.send_personal(websocket, {"type": "PONG"})
-
-                elif event_type == "LEAVE":
+                if event_type == "LEAVE":
                     break
 
-                elif event_type == "CHAT":
-                    # Save chat to DB
-                    chat_text = sanitize_input(event.get("text", ""))
-                    sender_name = event.get("sender", "Anonymous")
-                    
-                    if chat_text:
-                        from app.models.chat_message import ChatMessage
-                        new_chat = ChatMessage(
-                            meeting_id=meeting_id,
-                            sender_name=sender_name,
-                            sender_id=user_id,
-                            message=chat_text,
-                            timestamp=datetime.utcnow(),
-                        )
-                        db.add(new_chat)
-                        await db.commit()
-
-                        # Broadcast chat message
-                        await manager.broadcast(meeting_id, {
-                            "type": "CHAT",
-                            "sender": sender_name,
-                            "text": chat_text,
-                            "timestamp": datetime.utcnow().isoformat(),
-                        })
-
-                elif event_type == "REACTION":
-                    # Broadcast emoji reaction
-                    await manager.broadcast(meeting_id, {
-                        "type": "REACTION",
-                        "emoji": event.get("emoji", "👍"),
-                        "sender": event.get("sender", "Anonymous"),
-                        "timestamp": datetime.utcnow().isoformat(),
-                    })
-
-                elif event_type == "HAND_RAISE":
-                    # Broadcast hand raise status
-                    await manager.broadcast(meeting_id, {
-                        "type": "HAND_RAISE",
-                        "user_id": user_id,
-                        "is_raised": event.get("is_raised", True),
-                        "timestamp": datetime.utcnow().isoformat(),
-                    })
-
-                elif event_type == "CONFETTI":
-                    # Broadcast confetti trigger
-                    await manager.broadcast(meeting_id, {
-                        "type": "CONFETTI",
-                        "timestamp": datetime.utcnow().isoformat(),
-                    })
-
-                elif event_type == "POLL_CREATE":
-                    # Broadcast new poll
-                    # Sanitize question and options
-                    question = sanitize_input(event.get("question"))
-                    options = [sanitize_input(opt) for opt in event.get("options", [])]
-                    
-                    if question and options:
-                        await manager.broadcast(meeting_id, {
-                            "type": "POLL_CREATE",
-                            "question": question,
-                            "options": options,
-                            "sender": event.get("sender", "Host"),
-                            "timestamp": datetime.utcnow().isoformat(),
-                        })
-
-                elif event_type == "POLL_VOTE":
-                    # Broadcast a vote
-                    await manager.broadcast(meeting_id, {
-                        "type": "POLL_VOTE",
-                        "option_index": event.get("option_index"),
-                        "user_id": user_id,
-                        "timestamp": datetime.utcnow().isoformat(),
-                    })
-
-                elif event_type == "signal":
-                    target_id = event.get("target")
-                    payload = event.get("payload")
-                    
-                    target_ws = manager.get_socket(meeting_id, target_id)
-                    if target_ws:
-                        await manager.send_personal(target_ws, {
-                            "type": "signal",
-                            "sender": user_id,
-                            "payload": payload
-                        })
-
-                elif event_type == "WHITEBOARD":
-                    # Broadcast whiteboard actions to all EXCEPT sender
-                    wb_msg = {
-                        "type": "WHITEBOARD",
-                        "action": event.get("action"),
-                        "data": event.get("data"),
-                        "sender": user_id
-                    }
-                    # Send to all connections except the sender
-                    if meeting_id in manager.active_connections:
-                        for conn in list(manager.active_connections[meeting_id]):
-                            if conn != websocket:
-                                try:
-                                    await conn.send_json(wb_msg)
-                                except Exception:
-                                    pass
-
-                elif event_type == "NOTE_UPDATE":
-                    # Broadcast shared note changes
-                    await manager.broadcast(meeting_id, {
-                        "type": "NOTE_UPDATE",
-                        "noteText": event.get("noteText"),
-                        "sender": user_id
-                    })
-
-            except json.JSONDecodeError:
+                handler = _EVENT_HANDLERS.get(event_type)
+                if handler is not None:
+                    await handler(ctx, event)
+
+            except orjson.JSONDecodeError:
                 pass
 
     except WebSocketDisconnect:
@@ -485,18 +672,18 @@ async def websocket_endpoint(
     except Exception as e:
         logger.error("WebSocket error in meeting %d: %s", meeting_id, e, exc_info=True)
     finally:
+        _flush_note(ctx)
         manager.disconnect(websocket, meeting_id, user_id)
 
         # Update participant leave time
         try:
-            res = await db.execute(select(Participant).filter(
-                Participant.meeting_id == meeting_id,
-                Participant.user_id == user_id,
-            ))
-            participant = res.scalars().first()
-
-            if participant:
-                participant.leave_time = datetime.utcnow()
+            left = datetime.utcnow()
+            async with AsyncSessionLocal() as db:
+                await db.execute(lambda_stmt(
+                    lambda: update(Participant)
+                    .where(Participant.meeting_id == meeting_id, Participant.user_id == user_id)
+                    .values(leave_time=left)
+                ))
                 await db.commit()
         except Exception as e:
             logger.error("Error updating leave time for user %d meeting %d: %s", user_id, meeting_id, e)
@@ -505,29 +692,11 @@ async def websocket_endpoint(
             "type": "LEAVE",
             "user_id": user_id,
             "participant_count": manager.get_participant_count(meeting_id),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _iso_now(),
         })
 
         # Broadcast participant list update on leave
-        active_ids = list(manager.user_connections.get(meeting_id, {}).keys())
-        if active_ids:
-            u_stmt = select(User).filter(User.id.in_(active_ids))
-            u_res = await db.execute(u_stmt)
-            users = u_res.scalars().all()
-            
-            p_List = []
-            for u in users:
-                p_role = manager.get_role(meeting_id, u.id)
-                p_List.append({
-                    "id": u.id,
-                    "name": u.full_name or u.email,
-                    "role": p_role
-                })
-            
-            await manager.broadcast(meeting_id, {
-                "type": "participants",
-                "participants": p_List
-            })
-        else:
-             # Last user left, empty list? Not really needed as no one is there to receive.
-             pass
+        await manager.broadcast(meeting_id, {
+            "type": "participants_delta",
+            "remove": [user_id],
+        })
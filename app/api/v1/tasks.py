@@ -2,15 +2,19 @@
 Tasks API — Generate, List, Update, Delete, Batch Operations, and GitHub Export
 """
 from datetime import datetime, timezone
+import asyncio
 import logging
+from functools import lru_cache
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import and_, delete, exists, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.core.config import settings
+from app.core.redis import invalidate_cache
 from app.db.session import get_db
 from app.core.security import sanitize_input
 from app.models.meeting import Meeting
@@ -24,6 +28,38 @@ logger = logging.getLogger("meetingai.tasks")
 
 ALLOWED_PRIORITIES = {"low", "medium", "high"}
 ALLOWED_STATUSES = {"todo", "in-progress", "done"}
+# Issue-tracker exports post this many issues at a time (GitHub secondary rate limits)
+EXPORT_CONCURRENCY = 10
+
+# One pooled client for all exports so repeat exports reuse TCP/TLS connections
+_export_client: httpx.AsyncClient | None = None
+
+
+def _get_export_client() -> httpx.AsyncClient:
+    global _export_client
+    if _export_client is None or _export_client.is_closed:
+        _export_client = httpx.AsyncClient(
+            timeout=15.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return _export_client
+
+
+async def close_export_client() -> None:
+    """Close the shared export client (called on shutdown)."""
+    global _export_client
+    if _export_client is not None:
+        await _export_client.aclose()
+        _export_client = None
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_string(text: str) -> datetime:
+    """Parse an ISO-8601 string to naive UTC (memoized; AI due dates repeat a lot)."""
+    parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
 
 
 def _parse_due_date(value: datetime | str | None) -> datetime | None:
@@ -36,14 +72,62 @@ def _parse_due_date(value: datetime | str | None) -> datetime | None:
     text = str(value).strip()
     if not text:
         return None
-    normalized = text.replace("Z", "+00:00")
     try:
-        parsed = datetime.fromisoformat(normalized)
+        return _parse_iso_string(text)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail="Invalid due_date format. Use ISO-8601.") from exc
-    if parsed.tzinfo:
-        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
-    return parsed
+
+
+def _task_to_dict(task: Task) -> dict:
+    """TaskOut-shaped dict read straight off the row (DB values were validated on write)."""
+    return {
+        "id": task.id,
+        "meeting_id": task.meeting_id,
+        "title": task.title,
+        "subtitle_reference": task.subtitle_reference,
+        "owner": task.owner,
+        "status": task.status,
+        "priority": task.priority,
+        "estimated_minutes": task.estimated_minutes,
+        "time_spent": task.time_spent,
+        "due_date": task.due_date,
+        "created_at": task.created_at,
+    }
+
+
+def _json_response(payload) -> Response:
+    """Serialize with orjson, skipping response_model validation (kept for the OpenAPI schema)."""
+    return Response(content=orjson.dumps(payload), media_type="application/json")
+
+
+async def _owns_meeting(db: AsyncSession, meeting_id: int, user_id: int) -> bool:
+    """Ownership check as a single EXISTS, without loading the meeting row."""
+    return bool(await db.scalar(
+        select(exists().where(Meeting.id == meeting_id, Meeting.user_id == user_id))
+    ))
+
+
+async def _load_export_tasks(
+    db: AsyncSession, meeting_id: int, user_id: int, task_ids: list[int] | None
+) -> tuple[str | None, list[Task]]:
+    """Meeting title plus the tasks to export, in one round trip.
+
+    Outer-joining from Meeting keeps "meeting missing/not owned" (no rows,
+    title None) distinct from "meeting has no matching tasks" (one row with
+    a NULL task).
+    """
+    task_on = Task.meeting_id == Meeting.id
+    if task_ids:
+        task_on = and_(task_on, Task.id.in_(task_ids))
+    rows = (await db.execute(
+        select(Meeting.title, Task)
+        .outerjoin(Task, task_on)
+        .where(Meeting.id == meeting_id, Meeting.user_id == user_id)
+        .order_by(Task.id)
+    )).all()
+    if not rows:
+        return None, []
+    return rows[0][0], [task for _, task in rows if task is not None]
 
 
 def normalize_priority(value: str | None) -> str:
@@ -61,12 +145,7 @@ async def generate_tasks(
     current_user: User = Depends(get_current_user),
 ):
     """Auto-generate tasks from AI-extracted action items."""
-    result = await db.execute(
-        select(Meeting).filter(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
-    )
-    meeting = result.scalar_one_or_none()
-    
-    if not meeting:
+    if not await _owns_meeting(db, meeting_id, current_user.id):
         raise HTTPException(status_code=404, detail="Meeting not found")
 
     res = await db.execute(select(AIResult).filter(AIResult.meeting_id == meeting_id))
@@ -80,37 +159,49 @@ async def generate_tasks(
 
     actions_data = ai_result.actions_json.get("action_items", [])
     if not actions_data:
-        return []
+        return _json_response([])
 
-    # Get existing titles to avoid duplicates
-    existing_res = await db.execute(select(Task.title).filter(Task.meeting_id == meeting_id))
-    existing_titles = {row for row in existing_res.scalars().all()}
+    candidate_titles = [(item.get("task") or "Untitled task").strip()[:255] for item in actions_data]
+    # Only the candidates that already exist come back, not every title in the meeting
+    existing_res = await db.execute(
+        select(Task.title).where(Task.meeting_id == meeting_id, Task.title.in_(set(candidate_titles)))
+    )
+    existing_titles = set(existing_res.scalars().all())
 
-    created: list[Task] = []
-    for item in actions_data:
-        title = (item.get("task") or "Untitled task").strip()[:255]
+    rows: list[dict] = []
+    for item, title in zip(actions_data, candidate_titles):
         if title in existing_titles:
             continue
 
-        task = Task(
-            meeting_id=meeting_id,
-            title=title,
-            subtitle_reference=item.get("subtitle_ref"),
-            owner=item.get("owner"),
-            priority=normalize_priority(item.get("priority")),
-            due_date=_parse_due_date(item.get("due_date") or item.get("deadline")),
-            status="todo",
-        )
-        db.add(task)
-        created.append(task)
+        rows.append({
+            "meeting_id": meeting_id,
+            "title": title,
+            "subtitle_reference": item.get("subtitle_ref"),
+            "owner": item.get("owner"),
+            "priority": normalize_priority(item.get("priority")),
+            "due_date": _parse_due_date(item.get("due_date") or item.get("deadline")),
+            "status": "todo",
+        })
         existing_titles.add(title)
 
+    created: list[Task] = []
+    if rows:
+        # One multi-row INSERT ... RETURNING instead of N inserts + N refreshes
+        created = (await db.scalars(
+            insert(Task).returning(Task, sort_by_parameter_order=True), rows
+        )).all()
+        # Bulk inserts skip the ORM listener that maintains meetings.task_count
+        await db.execute(
+            update(Meeting)
+            .where(Meeting.id == meeting_id)
+            .values(task_count=Meeting.task_count + len(created))
+            .execution_options(synchronize_session=False)
+        )
     await db.commit()
-    for task in created:
-        await db.refresh(task)
+    await invalidate_cache(f"user:{current_user.id}:")
 
     logger.info("Generated %d tasks for meeting %d", len(created), meeting_id)
-    return created
+    return _json_response([_task_to_dict(t) for t in created])
 
 
 # ── Create Manual Task ────────────────────────────────────
@@ -122,11 +213,7 @@ async def create_task(
 ):
     """Manually create a new task."""
     # Verify meeting access
-    res = await db.execute(
-        select(Meeting).filter(Meeting.id == payload.meeting_id, Meeting.user_id == current_user.id)
-    )
-    meeting = res.scalar_one_or_none()
-    if not meeting:
+    if not await _owns_meeting(db, payload.meeting_id, current_user.id):
         raise HTTPException(status_code=404, detail="Meeting not found or access denied")
 
     task = Task(
@@ -142,8 +229,9 @@ async def create_task(
     db.add(task)
     await db.commit()
     await db.refresh(task)
+    await invalidate_cache(f"user:{current_user.id}:")
     logger.info("User %d created task %d", current_user.id, task.id)
-    return task
+    return _json_response(_task_to_dict(task))
 
 
 # ── List Tasks ────────────────────────────────────────────
@@ -186,7 +274,7 @@ async def list_tasks(
     )
     
     result = await db.execute(stmt)
-    return result.scalars().all()
+    return _json_response([_task_to_dict(t) for t in result.scalars().all()])
 
 
 # ── Update Task ──────────────────────────────────────────
@@ -218,8 +306,9 @@ async def update_task(
 
     await db.commit()
     await db.refresh(task)
+    await invalidate_cache(f"user:{current_user.id}:")
     logger.info("Updated task %d: %s", task_id, updates)
-    return task
+    return _json_response(_task_to_dict(task))
 
 
 # ── Delete Task ──────────────────────────────────────────
@@ -229,19 +318,30 @@ async def delete_task(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    # Ownership check and delete in one statement; no task row is loaded
     stmt = (
-        select(Task)
-        .join(Meeting, Meeting.id == Task.meeting_id)
-        .where(Task.id == task_id, Meeting.user_id == current_user.id)
+        delete(Task)
+        .where(
+            Task.id == task_id,
+            exists().where(Meeting.id == Task.meeting_id, Meeting.user_id == current_user.id),
+        )
+        .returning(Task.meeting_id)
+        .execution_options(synchronize_session=False)
     )
-    result = await db.execute(stmt)
-    task = result.scalar_one_or_none()
-    
-    if not task:
+    meeting_id = (await db.execute(stmt)).scalar_one_or_none()
+
+    if meeting_id is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    await db.delete(task)
+    # Core deletes skip the ORM listener that maintains meetings.task_count
+    await db.execute(
+        update(Meeting)
+        .where(Meeting.id == meeting_id)
+        .values(task_count=Meeting.task_count - 1)
+        .execution_options(synchronize_session=False)
+    )
     await db.commit()
+    await invalidate_cache(f"user:{current_user.id}:")
     logger.info("Deleted task %d", task_id)
 
 
@@ -261,26 +361,27 @@ async def batch_update_tasks(
     if payload.status not in ALLOWED_STATUSES:
         raise HTTPException(status_code=400, detail=f"Invalid status: {payload.status}")
 
+    # One UPDATE ... RETURNING for the whole batch instead of N flushed UPDATEs
     stmt = (
-        select(Task)
-        .join(Meeting, Meeting.id == Task.meeting_id)
-        .where(Task.id.in_(payload.task_ids), Meeting.user_id == current_user.id)
+        update(Task)
+        .where(
+            Task.id.in_(payload.task_ids),
+            Task.meeting_id.in_(select(Meeting.id).where(Meeting.user_id == current_user.id)),
+        )
+        .values(status=payload.status)
+        .returning(Task)
+        .execution_options(populate_existing=True)
     )
-    result = await db.execute(stmt)
-    tasks = result.scalars().all()
+    tasks = (await db.scalars(stmt)).all()
 
     if not tasks:
         raise HTTPException(status_code=404, detail="No matching tasks found")
 
-    for task in tasks:
-        task.status = payload.status
-
     await db.commit()
-    # No need to refresh all if just returning, but better to be safe
-    # Or just return updated objects (SQLAlchemy tracks changes)
-    
+    await invalidate_cache(f"user:{current_user.id}:")
+
     logger.info("Batch updated %d tasks to status '%s'", len(tasks), payload.status)
-    return tasks
+    return _json_response([_task_to_dict(t) for t in tasks])
 
 
 # ── GitHub Issue Export ──────────────────────────────────
@@ -335,12 +436,8 @@ async def export_to_github(
     current_user: User = Depends(get_current_user),
 ):
     """Create GitHub issues from meeting tasks."""
-    result = await db.execute(
-        select(Meeting).filter(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
-    )
-    meeting = result.scalar_one_or_none()
-    
-    if not meeting:
+    meeting_title, tasks = await _load_export_tasks(db, meeting_id, current_user.id, payload.task_ids)
+    if meeting_title is None:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
     # Use payload token (user specific) or settings token (server global)
@@ -351,65 +448,68 @@ async def export_to_github(
     if not payload.repo or "/" not in payload.repo or payload.repo.startswith("http") or ".." in payload.repo:
         raise HTTPException(status_code=400, detail="Invalid repository format. Use 'owner/repo'.")
 
-    stmt = select(Task).filter(Task.meeting_id == meeting_id)
-    if payload.task_ids:
-        stmt = stmt.filter(Task.id.in_(payload.task_ids))
-    
-    res = await db.execute(stmt)
-    tasks = res.scalars().all()
-
     if not tasks:
         raise HTTPException(status_code=400, detail="No tasks found to export.")
 
     headers = {
         "Authorization": f"token {gh_token}",
         "Accept": "application/vnd.github.v3+json",
+        "Content-Type": "application/json",
     }
 
     priority_labels = {"high": "priority: high", "medium": "priority: medium", "low": "priority: low"}
 
-    created_issues = []
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        for task in tasks:
-            body = f"**Meeting:** {meeting.title}\n"
-            body += f"**Priority:** {task.priority}\n"
-            body += f"**Owner:** {task.owner or 'Unassigned'}\n"
-            if task.due_date:
-                body += f"**Due Date:** {task.due_date.date().isoformat()}\n"
-            if task.subtitle_reference:
-                body += f"**Source:** {task.subtitle_reference}\n"
-            body += f"\n---\n*Auto-generated by AI Meeting Intelligence System*"
-
-            issue_data = {
-                "title": f"[Meeting Task] {task.title}",
-                "body": body,
-                "labels": ["meeting-task", priority_labels.get(task.priority, "priority: medium")],
-            }
+    limit = asyncio.Semaphore(EXPORT_CONCURRENCY)
+
+    meeting_line = f"**Meeting:** {meeting_title}\n"
+    footer = "\n---\n*Auto-generated by AI Meeting Intelligence System*"
+
+    async def _post_issue(client: httpx.AsyncClient, task: Task) -> dict:
+        parts = [
+            meeting_line,
+            f"**Priority:** {task.priority}\n",
+            f"**Owner:** {task.owner or 'Unassigned'}\n",
+        ]
+        if task.due_date:
+            parts.append(f"**Due Date:** {task.due_date.date().isoformat()}\n")
+        if task.subtitle_reference:
+            parts.append(f"**Source:** {task.subtitle_reference}\n")
+        parts.append(footer)
+
+        issue_data = {
+            "title": f"[Meeting Task] {task.title}",
+            "body": "".join(parts),
+            "labels": ["meeting-task", priority_labels.get(task.priority, "priority: medium")],
+        }
 
-            try:
+        try:
+            async with limit:
                 resp = await client.post(
                     f"https://api.github.com/repos/{payload.repo}/issues",
                     headers=headers,
-                    json=issue_data,
+                    content=orjson.dumps(issue_data),
                 )
 
-                if resp.status_code == 201:
-                    issue = resp.json()
-                    created_issues.append({
-                        "task_id": task.id,
-                        "issue_number": issue["number"],
-                        "url": issue["html_url"],
-                    })
-                    logger.info("Created GitHub issue #%d for task %d", issue["number"], task.id)
-                else:
-                    logger.error("GitHub issue creation failed: %s %s", resp.status_code, resp.text[:200])
-                    created_issues.append({
-                        "task_id": task.id,
-                        "error": f"GitHub API returned {resp.status_code}",
-                    })
-            except Exception as e:
-                logger.error("GitHub API error: %s", e)
-                created_issues.append({"task_id": task.id, "error": str(e)})
+            if resp.status_code == 201:
+                issue = resp.json()
+                logger.info("Created GitHub issue #%d for task %d", issue["number"], task.id)
+                return {
+                    "task_id": task.id,
+                    "issue_number": issue["number"],
+                    "url": issue["html_url"],
+                }
+            logger.error("GitHub issue creation failed: %s %s", resp.status_code, resp.text[:200])
+            return {
+                "task_id": task.id,
+                "error": f"GitHub API returned {resp.status_code}",
+            }
+        except Exception as e:
+            logger.error("GitHub API error: %s", e)
+            return {"task_id": task.id, "error": str(e)}
+
+    # Issues are independent, so post them concurrently (results keep task order)
+    client = _get_export_client()
+    created_issues = list(await asyncio.gather(*(_post_issue(client, t) for t in tasks)))
 
     successful = len([i for i in created_issues if "url" in i])
     return {
@@ -427,11 +527,8 @@ async def export_to_jira(
     current_user: User = Depends(get_current_user),
 ):
     """Create Jira issues from meeting tasks."""
-    result = await db.execute(
-        select(Meeting).filter(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
-    )
-    meeting = result.scalar_one_or_none()
-    if not meeting:
+    meeting_title, tasks = await _load_export_tasks(db, meeting_id, current_user.id, payload.task_ids)
+    if meeting_title is None:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
     jira_base_url = payload.base_url or settings.jira_base_url
@@ -449,68 +546,67 @@ async def export_to_jira(
     jira_base_url = _validate_jira_base_url(jira_base_url)
     jira_project_key = _validate_jira_project_key(jira_project_key)
 
-    stmt = select(Task).filter(Task.meeting_id == meeting_id)
-    if payload.task_ids:
-        stmt = stmt.filter(Task.id.in_(payload.task_ids))
-    res = await db.execute(stmt)
-    tasks = res.scalars().all()
     if not tasks:
         raise HTTPException(status_code=400, detail="No tasks found to export.")
 
-    created_issues = []
     auth = httpx.BasicAuth(jira_email, jira_token)
     headers = {"Accept": "application/json", "Content-Type": "application/json"}
+    limit = asyncio.Semaphore(EXPORT_CONCURRENCY)
 
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        for task in tasks:
-            description_lines = [
-                f"Meeting: {meeting.title}",
-                f"Priority: {task.priority}",
-                f"Owner: {task.owner or 'Unassigned'}",
-            ]
-            if task.due_date:
-                description_lines.append(f"Due Date: {task.due_date.date().isoformat()}")
-            if task.subtitle_reference:
-                description_lines.append(f"Source: {task.subtitle_reference}")
-            description_lines.append("Auto-generated by AI Meeting Intelligence System")
-
-            issue_payload = {
-                "fields": {
-                    "project": {"key": jira_project_key},
-                    "summary": f"[Meeting Task] {task.title}"[:255],
-                    "description": _jira_description("\n".join(description_lines)),
-                    "issuetype": {"name": issue_type},
-                    "labels": ["meeting-task", f"priority-{(task.priority or 'medium').lower()}"],
-                }
+    async def _post_issue(client: httpx.AsyncClient, task: Task) -> dict:
+        description_lines = [
+            f"Meeting: {meeting_title}",
+            f"Priority: {task.priority}",
+            f"Owner: {task.owner or 'Unassigned'}",
+        ]
+        if task.due_date:
+            description_lines.append(f"Due Date: {task.due_date.date().isoformat()}")
+        if task.subtitle_reference:
+            description_lines.append(f"Source: {task.subtitle_reference}")
+        description_lines.append("Auto-generated by AI Meeting Intelligence System")
+
+        issue_payload = {
+            "fields": {
+                "project": {"key": jira_project_key},
+                "summary": f"[Meeting Task] {task.title}"[:255],
+                "description": _jira_description("\n".join(description_lines)),
+                "issuetype": {"name": issue_type},
+                "labels": ["meeting-task", f"priority-{(task.priority or 'medium').lower()}"],
             }
-            if task.due_date:
-                issue_payload["fields"]["duedate"] = task.due_date.date().isoformat()
+        }
+        if task.due_date:
+            issue_payload["fields"]["duedate"] = task.due_date.date().isoformat()
 
-            try:
+        try:
+            async with limit:
                 resp = await client.post(
                     f"{jira_base_url}/rest/api/3/issue",
                     headers=headers,
                     auth=auth,
-                    json=issue_payload,
+                    content=orjson.dumps(issue_payload),
+                    timeout=20.0,
                 )
-                if resp.status_code in (200, 201):
-                    issue = resp.json()
-                    issue_key = issue.get("key")
-                    created_issues.append({
-                        "task_id": task.id,
-                        "issue_key": issue_key,
-                        "url": f"{jira_base_url}/browse/{issue_key}" if issue_key else None,
-                    })
-                    logger.info("Created Jira issue %s for task %d", issue_key, task.id)
-                else:
-                    created_issues.append({
-                        "task_id": task.id,
-                        "error": f"Jira API returned {resp.status_code}",
-                    })
-                    logger.error("Jira issue creation failed: %s %s", resp.status_code, resp.text[:200])
-            except Exception as exc:
-                created_issues.append({"task_id": task.id, "error": str(exc)})
-                logger.error("Jira API error: %s", exc)
+            if resp.status_code in (200, 201):
+                issue = resp.json()
+                issue_key = issue.get("key")
+                logger.info("Created Jira issue %s for task %d", issue_key, task.id)
+                return {
+                    "task_id": task.id,
+                    "issue_key": issue_key,
+                    "url": f"{jira_base_url}/browse/{issue_key}" if issue_key else None,
+                }
+            logger.error("Jira issue creation failed: %s %s", resp.status_code, resp.text[:200])
+            return {
+                "task_id": task.id,
+                "error": f"Jira API returned {resp.status_code}",
+            }
+        except Exception as exc:
+            logger.error("Jira API error: %s", exc)
+            return {"task_id": task.id, "error": str(exc)}
+
+    # Issues are independent, so post them concurrently (results keep task order)
+    client = _get_export_client()
+    created_issues = list(await asyncio.gather(*(_post_issue(client, t) for t in tasks)))
 
     successful = len([i for i in created_issues if i.get("issue_key")])
     return {
@@ -538,11 +634,8 @@ async def export_to_linear(
         payload = LinearExportRequest()
     from app.services.linear_service import LinearService
 
-    result = await db.execute(
-        select(Meeting).filter(Meeting.id == meeting_id, Meeting.user_id == current_user.id)
-    )
-    meeting = result.scalar_one_or_none()
-    if not meeting:
+    meeting_title, tasks = await _load_export_tasks(db, meeting_id, current_user.id, payload.task_ids)
+    if meeting_title is None:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
     if not current_user.linear_access_token:
@@ -555,12 +648,6 @@ async def export_to_linear(
     if not team_id:
         raise HTTPException(status_code=400, detail="Linear team ID not provided.")
 
-    stmt = select(Task).filter(Task.meeting_id == meeting_id)
-    if payload.task_ids:
-        stmt = stmt.filter(Task.id.in_(payload.task_ids))
-    res = await db.execute(stmt)
-    tasks = res.scalars().all()
-
     if not tasks:
         raise HTTPException(status_code=400, detail="No tasks found to export.")
 
@@ -576,7 +663,7 @@ async def export_to_linear(
 
     for task in tasks:
         description_lines = [
-            f"**Meeting:** {meeting.title}",
+            f"**Meeting:** {meeting_title}",
             f"**Priority:** {task.priority}",
             f"**Owner:** {task.owner or 'Unassigned'}"
         ]
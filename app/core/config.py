@@ -22,6 +22,9 @@ class Settings(BaseSettings):
     # ── Database ───────────────────────────────────────
     database_url: str = "sqlite:///./meeting_intel.db"
     db_ssl_verify: bool = False
+    db_pool_size: int = 20
+    db_max_overflow: int = 40
+    db_pool_recycle: int = 1800     # Seconds before a pooled connection is replaced
 
     # ── AI / Gemini ────────────────────────────────────
     gemini_api_key: str = ""
@@ -59,6 +62,9 @@ class Settings(BaseSettings):
     rag_top_k: int = 5             # Top-K retrieval
     rag_model_name: str = "all-MiniLM-L6-v2"
 
+    # ── Live Speech ────────────────────────────────────
+    speech_workers: int = 0        # Transcription processes (0 = half the CPU cores)
+
     # ── Redis / Celery ─────────────────────────────────
     redis_host: str = "localhost"
     redis_port: int = 6379
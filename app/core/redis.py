@@ -1,5 +1,6 @@
 import json
 import logging
+from cachetools import TTLCache
 from redis.asyncio import Redis
 
 from app.core.config import settings
@@ -8,6 +9,11 @@ logger = logging.getLogger("meetingai.redis")
 
 redis_client: Redis = None
 
+# Per-process L1 in front of Redis for hot per-user aggregates (e.g. dashboard).
+# Short TTL bounds cross-worker staleness; invalidate_cache() purges it locally.
+LOCAL_CACHE_TTL = 30
+_local_cache: TTLCache = TTLCache(maxsize=10_000, ttl=LOCAL_CACHE_TTL)
+
 async def init_redis():
     """Initialize global redis connection pool."""
     global redis_client
@@ -47,8 +53,27 @@ async def set_cache(key: str, value: dict | list | str, ttl: int = 3600):
     except Exception:
         pass
 
+async def try_acquire_lock(key: str, ttl: int) -> bool:
+    """Best-effort cross-worker lock (SET NX EX). Without Redis, every caller gets it."""
+    if not redis_client:
+        return True
+    try:
+        return bool(await redis_client.set(key, "1", nx=True, ex=ttl))
+    except Exception:
+        return True
+
+def get_local_cache(key: str) -> dict | list | str | None:
+    """Retrieve value from the in-process cache (no I/O)."""
+    return _local_cache.get(key)
+
+def set_local_cache(key: str, value: dict | list | str):
+    """Save value to the in-process cache for LOCAL_CACHE_TTL seconds."""
+    _local_cache[key] = value
+
 async def invalidate_cache(prefix: str):
     """Delete all keys matching a prefix (e.g., 'meeting:123:*')."""
+    for key in [k for k in list(_local_cache) if k.startswith(prefix)]:
+        _local_cache.pop(key, None)
     if not redis_client:
         return
     try:
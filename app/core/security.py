@@ -1,4 +1,6 @@
 import re
+import time
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 from jose import JWTError, jwt
@@ -44,15 +46,49 @@ def decode_token(token: str) -> dict:
         raise ValueError("Invalid token") from exc
 
 
-def sanitize_input(text: str) -> str:
-    """Sanitize input text to prevent XSS."""
-    if not text:
-        return text
+@lru_cache(maxsize=1024)
+def _decode_cached(token: str) -> dict:
+    return decode_token(token)
+
+
+def decode_token_cached(token: str) -> dict:
+    """decode_token() memoized per token string (WebSocket reconnects reuse the same JWT).
+
+    The signature is verified once; expiry is still checked on every call.
+    Callers must not mutate the returned dict.
+    """
+    payload = _decode_cached(token)
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        raise ValueError("Invalid token")
+    return payload
+
+
+# Anything bleach would rewrite (markup, entities) or the fallback would strip.
+_UNSAFE_RE = re.compile(r"[<>&\x00-\x1f\x7f]")
+_TAG_RE = re.compile(r"<[^>]*?>")
+_CONTROL_RE = re.compile(r"[\x00-\x1f\x7f]")
+
+
+@lru_cache(maxsize=1024)
+def _sanitize_cached(text: str) -> str:
     try:
         import bleach
-        return bleach.clean(str(text), tags=[], attributes={}, strip=True)
+        return bleach.clean(text, tags=[], attributes={}, strip=True)
     except Exception:
         # Fallback for environments where bleach is unavailable.
-        cleaned = re.sub(r"<[^>]*?>", "", str(text))
-        cleaned = re.sub(r"[\x00-\x1f\x7f]", "", cleaned)
+        cleaned = _TAG_RE.sub("", text)
+        cleaned = _CONTROL_RE.sub("", cleaned)
         return cleaned.strip()
+
+
+def sanitize_input(text: str) -> str:
+    """Sanitize input text to prevent XSS (memoized; titles and names repeat a lot)."""
+    if not text:
+        return text
+    text = str(text)
+    # Plain text (the common case) comes back unchanged from either path, so
+    # skip the cache and the HTML parse entirely.
+    if _UNSAFE_RE.search(text) is None and text == text.strip():
+        return text
+    return _sanitize_cached(text)
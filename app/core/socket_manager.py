@@ -3,16 +3,30 @@ WebSocket Connection Manager
 ==============================
 Manages real-time connections for live meetings with:
   - Per-meeting connection tracking
+  - Per-client send queues (a slow socket never stalls a broadcast)
   - Dead connection cleanup
   - Participant count broadcasting
 """
 from fastapi import WebSocket
-from typing import Dict, List
-import json
+from starlette.websockets import WebSocketState
+from typing import Dict, List, Optional
+import asyncio
 import logging
 
+import orjson
+
 logger = logging.getLogger("meetingai.ws")
 
+# A client that can't accept a frame within this window is treated as dead
+SEND_TIMEOUT = 5.0
+# Frames buffered per client; a client this far behind starts losing the oldest
+SEND_QUEUE_SIZE = 200
+
+
+def encode_message(message: dict) -> str:
+    """Serialize an outbound event once with orjson (int keys allowed, as with json.dumps)."""
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 class ConnectionManager:
     def __init__(self):
@@ -20,27 +34,43 @@ class ConnectionManager:
         self.active_connections: Dict[int, List[WebSocket]] = {}
         # meeting_id -> { user_id -> websocket }
         self.user_connections: Dict[int, Dict[int, WebSocket]] = {}
+        # meeting_id -> { user_id -> display name }, filled on connect for participant lists
+        self.user_names: Dict[int, Dict[int, str]] = {}
         # meeting_id -> { user_id -> role } ('host', 'presenter', 'viewer')
         self.roles: Dict[int, Dict[int, str]] = {}
         # meeting_id -> { 'locked': bool, 'waiting_room': bool, 'password': str }
         self.settings: Dict[int, dict] = {}
-        # meeting_id -> list of (websocket, user_id) waiting for approval
-        self.waiting_room: Dict[int, List] = {}
-
-    async def connect(self, websocket: WebSocket, meeting_id: int, user_id: int):
-        await websocket.accept()
+        # meeting_id -> { websocket -> (user_id, admit event) } waiting for approval
+        self.waiting_room: Dict[int, Dict[WebSocket, tuple]] = {}
+        # websocket -> outbound frame queue, drained by that socket's writer task
+        self.send_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.writers: Dict[WebSocket, asyncio.Task] = {}
+
+    async def connect(self, websocket: WebSocket, meeting_id: int, user_id: int, name: Optional[str] = None):
+        # Waiting-room sockets were already accepted while they waited
+        if websocket.client_state == WebSocketState.CONNECTING:
+            await websocket.accept()
         if meeting_id not in self.active_connections:
             self.active_connections[meeting_id] = []
             self.user_connections[meeting_id] = {}
+            self.user_names[meeting_id] = {}
             self.settings[meeting_id] = {'locked': False, 'waiting_room': False, 'password': None}
-            self.roles[meeting_id] = {}
-            self.waiting_room[meeting_id] = []
+            self.roles.setdefault(meeting_id, {})  # the host role is set before connect()
+            self.waiting_room.setdefault(meeting_id, {})
             
         self.active_connections[meeting_id].append(websocket)
         self.user_connections[meeting_id][user_id] = websocket
+        self.user_names.setdefault(meeting_id, {})[user_id] = name or f"User {user_id}"
+        queue = asyncio.Queue(SEND_QUEUE_SIZE)
+        self.send_queues[websocket] = queue
+        self.writers[websocket] = asyncio.create_task(self._writer(websocket, meeting_id, queue))
         logger.info("WebSocket connected to meeting %d user %d (total: %d)", meeting_id, user_id, len(self.active_connections[meeting_id]))
 
     def disconnect(self, websocket: WebSocket, meeting_id: int, user_id: int = None):
+        self.send_queues.pop(websocket, None)
+        writer = self.writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
         if meeting_id in self.active_connections:
             if websocket in self.active_connections[meeting_id]:
                 self.active_connections[meeting_id].remove(websocket)
@@ -48,15 +78,18 @@ class ConnectionManager:
             # Remove from user map
             if user_id and meeting_id in self.user_connections and user_id in self.user_connections[meeting_id]:
                 del self.user_connections[meeting_id][user_id]
+                self.user_names.get(meeting_id, {}).pop(user_id, None)
             elif meeting_id in self.user_connections:
                 # Fallback if user_id not provided, find by value
                 params = [k for k, v in self.user_connections[meeting_id].items() if v == websocket]
                 for k in params:
                     del self.user_connections[meeting_id][k]
+                    self.user_names.get(meeting_id, {}).pop(k, None)
 
             if not self.active_connections[meeting_id]:
                 del self.active_connections[meeting_id]
                 if meeting_id in self.user_connections: del self.user_connections[meeting_id]
+                if meeting_id in self.user_names: del self.user_names[meeting_id]
                 if meeting_id in self.roles: del self.roles[meeting_id]
                 if meeting_id in self.settings: del self.settings[meeting_id]
                 if meeting_id in self.waiting_room: del self.waiting_room[meeting_id]
@@ -68,27 +101,53 @@ class ConnectionManager:
     def get_participant_count(self, meeting_id: int) -> int:
         return len(self.active_connections.get(meeting_id, []))
 
-    async def broadcast(self, meeting_id: int, message: dict):
-        if meeting_id not in self.active_connections:
-            return
+    def get_participant(self, meeting_id: int, user_id: int) -> dict:
+        name = self.user_names.get(meeting_id, {}).get(user_id, f"User {user_id}")
+        return {"id": user_id, "name": name, "role": self.get_role(meeting_id, user_id), "avatar": None}
 
-        dead_connections = []
-        # Create a copy to iterate safely
-        connections = list(self.active_connections[meeting_id])
-        
-        for connection in connections:
+    def get_participants(self, meeting_id: int) -> list[dict]:
+        """Connected users with their current role, built from memory (no DB query)."""
+        return [self.get_participant(meeting_id, uid) for uid in self.user_connections.get(meeting_id, {})]
+
+    async def _writer(self, websocket: WebSocket, meeting_id: int, queue: asyncio.Queue):
+        """Send queued frames to one client so a slow socket only delays itself."""
+        while True:
+            text = await queue.get()
             try:
-                await connection.send_json(message)
+                await asyncio.wait_for(websocket.send_text(text), timeout=SEND_TIMEOUT)
             except Exception as e:
-                logger.warning("Dead connection detected in meeting %d: %s", meeting_id, e)
-                dead_connections.append(connection)
+                logger.warning("Dead connection detected in meeting %d: %r", meeting_id, e)
+                self.disconnect(websocket, meeting_id)
+                return
+
+    async def broadcast(self, meeting_id: int, message: dict, exclude: Optional[WebSocket] = None):
+        if meeting_id not in self.active_connections:
+            return
+
+        # Encode once for every recipient rather than per send_json() call
+        text = encode_message(message)
+
+        # Only enqueue here; each socket's writer task does the actual send
+        for connection in list(self.active_connections[meeting_id]):
+            if connection is exclude:
+                continue
+            self._enqueue(connection, text)
+
+    def _enqueue(self, websocket: WebSocket, text: str) -> None:
+        queue = self.send_queues.get(websocket)
+        if queue is None:
+            return
+        if queue.full():
+            queue.get_nowait()  # drop the oldest frame for a client that fell behind
+        queue.put_nowait(text)
 
-        for dead in dead_connections:
-            self.disconnect(dead, meeting_id)
+    def send_queued(self, websocket: WebSocket, message: dict) -> None:
+        """Queue a message for one connected socket, in order with its broadcasts."""
+        self._enqueue(websocket, encode_message(message))
 
     async def send_personal(self, websocket: WebSocket, message: dict):
         try:
-            await websocket.send_json(message)
+            await websocket.send_text(encode_message(message))
         except Exception as e:
             logger.warning("Failed to send personal message: %s", e)
 
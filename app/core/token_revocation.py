@@ -1,11 +1,17 @@
 from datetime import datetime
 
+from cachetools import TTLCache
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.auth_token_blocklist import AuthTokenBlocklist
 from app.models.password_reset_token import PasswordResetToken
 
+# jti values recently confirmed NOT revoked. Revocations in this process evict
+# their entry; ones made by another worker take effect within the TTL.
+REVOCATION_CACHE_TTL = 30
+_not_revoked: TTLCache = TTLCache(maxsize=10_000, ttl=REVOCATION_CACHE_TTL)
+
 
 def exp_to_datetime(exp: int | float | datetime | None) -> datetime | None:
     if exp is None:
@@ -24,6 +30,16 @@ async def is_jti_revoked(db: AsyncSession, jti: str | None) -> bool:
     return result.scalar_one_or_none() is not None
 
 
+async def is_jti_revoked_cached(db: AsyncSession, jti: str | None) -> bool:
+    """is_jti_revoked() for connect-heavy paths: "not revoked" answers are cached briefly."""
+    if not jti or jti in _not_revoked:
+        return False
+    revoked = await is_jti_revoked(db, jti)
+    if not revoked:
+        _not_revoked[jti] = True
+    return revoked
+
+
 async def revoke_token(
     db: AsyncSession,
     *,
@@ -34,6 +50,7 @@ async def revoke_token(
 ) -> None:
     if not jti:
         return
+    _not_revoked.pop(jti, None)
     if await is_jti_revoked(db, jti):
         return
     db.add(
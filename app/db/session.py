@@ -4,7 +4,7 @@ Database Session Management
 Provides async engine for FastAPI application and sync engine for migrations/celery.
 """
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
@@ -61,17 +61,30 @@ if "sqlite" in async_db_url:
         "connect_args": connect_args,
     }
 else:
+    # asyncpg behind the default AsyncAdaptedQueuePool: connections are reused
+    # across requests, pre-ping catches ones the server dropped
     engine_kwargs = {
         "echo": settings.debug,
         "pool_pre_ping": True,
-        "pool_size": 20,
-        "max_overflow": 40,
-        "pool_recycle": 300,   # Recycle every 5 min to prevent stale connections
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle,
         "connect_args": connect_args,
     }
 
 async_engine = create_async_engine(async_db_url, **engine_kwargs)
 
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """SQLite ignores ON DELETE CASCADE unless foreign keys are switched on per connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+if "sqlite" in async_db_url:
+    event.listen(async_engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
+
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine,
     expire_on_commit=False,
@@ -96,6 +109,9 @@ engine = create_engine(
     connect_args=sync_connect_args
 )
 
+if "sqlite" in sync_db_url:
+    event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 
@@ -57,6 +57,49 @@ def _ensure_schema_compatibility() -> None:
                 conn.execute(text("CREATE INDEX IF NOT EXISTS ix_tasks_due_date ON tasks (due_date)"))
                 logger.info("Applied schema upgrade: added ix_tasks_due_date index")
 
+            if "ix_tasks_meeting_status_priority" not in task_indexes:
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_tasks_meeting_status_priority ON tasks (meeting_id, status, priority)"
+                ))
+                logger.info("Applied schema upgrade: added ix_tasks_meeting_status_priority index")
+
+            # Media uploads: SHA-256 digest of the uploaded file
+            if "meetings" in tables:
+                meeting_columns = {col["name"] for col in inspector.get_columns("meetings")}
+                if "media_hash" not in meeting_columns:
+                    conn.execute(text("ALTER TABLE meetings ADD COLUMN media_hash VARCHAR(64)"))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_meetings_media_hash ON meetings (media_hash)"))
+                    logger.info("Applied schema upgrade: added meetings.media_hash column")
+
+                # Denormalized child counters, backfilled once from the child tables
+                if "subtitle_count" not in meeting_columns:
+                    bool_false = "false" if dialect_name == "postgresql" else "0"
+                    conn.execute(text("ALTER TABLE meetings ADD COLUMN subtitle_count INTEGER NOT NULL DEFAULT 0"))
+                    conn.execute(text("ALTER TABLE meetings ADD COLUMN task_count INTEGER NOT NULL DEFAULT 0"))
+                    conn.execute(text(f"ALTER TABLE meetings ADD COLUMN has_analysis BOOLEAN NOT NULL DEFAULT {bool_false}"))
+                    conn.execute(text("""
+                        UPDATE meetings SET
+                            subtitle_count = (SELECT COUNT(*) FROM subtitles s WHERE s.meeting_id = meetings.id),
+                            task_count = (SELECT COUNT(*) FROM tasks t WHERE t.meeting_id = meetings.id),
+                            has_analysis = EXISTS (SELECT 1 FROM ai_results a WHERE a.meeting_id = meetings.id)
+                    """))
+                    logger.info("Applied schema upgrade: added meetings subtitle/task counters")
+
+                meeting_indexes = {idx["name"] for idx in inspector.get_indexes("meetings")}
+                if "ix_meetings_user_created" not in meeting_indexes:
+                    conn.execute(text(
+                        "CREATE INDEX IF NOT EXISTS ix_meetings_user_created ON meetings (user_id, created_at DESC)"
+                    ))
+                    logger.info("Applied schema upgrade: added ix_meetings_user_created index")
+
+            if "subtitles" in tables:
+                subtitle_indexes = {idx["name"] for idx in inspector.get_indexes("subtitles")}
+                if "ix_subtitles_meeting_start" not in subtitle_indexes:
+                    conn.execute(text(
+                        "CREATE INDEX IF NOT EXISTS ix_subtitles_meeting_start ON subtitles (meeting_id, start_time)"
+                    ))
+                    logger.info("Applied schema upgrade: added ix_subtitles_meeting_start index")
+
             # Linear integration: add linear_access_token to users table
             if "users" in tables:
                 user_columns = {col["name"] for col in inspector.get_columns("users")}
@@ -151,16 +194,41 @@ async def lifespan(app: FastAPI):
 
     try:
         import asyncio
-        from app.ai.speech_service import get_speech_processor
-        asyncio.create_task(asyncio.to_thread(get_speech_processor))
+        from app.ai.speech_service import warm_speech_workers
+        asyncio.create_task(warm_speech_workers())
         logger.info("Background model warmup task launched")
     except Exception as e:
         logger.warning(f"Failed to launch model warmup: {e}")
 
+    dashboard_warmer = None
+    try:
+        import asyncio
+        from app.api.v1.meetings import warm_dashboard_caches
+        dashboard_warmer = asyncio.create_task(warm_dashboard_caches())
+    except Exception as e:
+        logger.warning(f"Failed to launch dashboard cache warmer: {e}")
+
     yield  # Application runs here
 
     # Shutdown
     logger.info("Application shutting down...")
+    if dashboard_warmer:
+        dashboard_warmer.cancel()
+    try:
+        from app.ai.speech_service import shutdown_speech_pool
+        shutdown_speech_pool()
+    except Exception as e:
+        logger.error(f"Failed to stop speech workers: {e}")
+    try:
+        from app.api.v1.process_meeting import stop_live_writer
+        await stop_live_writer()
+    except Exception as e:
+        logger.error(f"Failed to flush live meeting writes: {e}")
+    try:
+        from app.api.v1.tasks import close_export_client
+        await close_export_client()
+    except Exception as e:
+        logger.error(f"Failed to close export HTTP client: {e}")
     try:
         from app.core.redis import close_redis
         await close_redis()
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, event, false, update
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base_class import Base
@@ -33,9 +33,64 @@ class Meeting(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     ended_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
-    # Relationships
+    # SHA-256 of uploaded media (media uploads only) — keys the transcript cache
+    media_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+
+    # Denormalized child counters for list/dashboard reads (see listeners below)
+    subtitle_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    task_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    has_analysis: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false(), nullable=False)
+
+    # Relationships — children carry ON DELETE CASCADE, so deletes are left to the database
     user = relationship("User", back_populates="meetings")
-    tasks = relationship("Task", back_populates="meeting", cascade="all, delete-orphan")
-    participants = relationship("Participant", back_populates="meeting", cascade="all, delete-orphan")
-    subtitles = relationship("Subtitle", back_populates="meeting", cascade="all, delete-orphan")
-    ai_result = relationship("AIResult", back_populates="meeting", uselist=False, cascade="all, delete-orphan")
+    tasks = relationship("Task", back_populates="meeting", cascade="all, delete-orphan", passive_deletes=True)
+    participants = relationship("Participant", back_populates="meeting", cascade="all, delete-orphan", passive_deletes=True)
+    subtitles = relationship("Subtitle", back_populates="meeting", cascade="all, delete-orphan", passive_deletes=True)
+    ai_result = relationship("AIResult", back_populates="meeting", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+
+
+# Backs "meetings for user X, newest first" (list, dashboard) as an index-ordered scan
+Index("ix_meetings_user_created", Meeting.user_id, Meeting.created_at.desc())
+
+
+# ── Counter maintenance ──────────────────────────────────
+# ORM flushes of child rows keep the counters above in step. Bulk loads that
+# bypass the unit of work (executemany / COPY) bump the counter themselves;
+# cascaded deletes take the meeting row with them, so nothing to decrement.
+from app.models.subtitle import Subtitle  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from app.models.ai_result import AIResult  # noqa: E402
+
+
+def _update_meeting(connection, meeting_id: int, **values) -> None:
+    connection.execute(update(Meeting.__table__).where(Meeting.__table__.c.id == meeting_id).values(**values))
+
+
+@event.listens_for(Subtitle, "after_insert")
+def _subtitle_inserted(mapper, connection, target):
+    _update_meeting(connection, target.meeting_id, subtitle_count=Meeting.__table__.c.subtitle_count + 1)
+
+
+@event.listens_for(Subtitle, "after_delete")
+def _subtitle_deleted(mapper, connection, target):
+    _update_meeting(connection, target.meeting_id, subtitle_count=Meeting.__table__.c.subtitle_count - 1)
+
+
+@event.listens_for(Task, "after_insert")
+def _task_inserted(mapper, connection, target):
+    _update_meeting(connection, target.meeting_id, task_count=Meeting.__table__.c.task_count + 1)
+
+
+@event.listens_for(Task, "after_delete")
+def _task_deleted(mapper, connection, target):
+    _update_meeting(connection, target.meeting_id, task_count=Meeting.__table__.c.task_count - 1)
+
+
+@event.listens_for(AIResult, "after_insert")
+def _ai_result_inserted(mapper, connection, target):
+    _update_meeting(connection, target.meeting_id, has_analysis=True)
+
+
+@event.listens_for(AIResult, "after_delete")
+def _ai_result_deleted(mapper, connection, target):
+    _update_meeting(connection, target.meeting_id, has_analysis=False)
@@ -1,10 +1,14 @@
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Float
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Float
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base_class import Base
 
 class Subtitle(Base):
     __tablename__ = "subtitles"
+    __table_args__ = (
+        # Transcript reads filter by meeting and order by start_time
+        Index("ix_subtitles_meeting_start", "meeting_id", "start_time"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     meeting_id: Mapped[int] = mapped_column(ForeignKey("meetings.id", ondelete="CASCADE"), index=True)
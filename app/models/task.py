@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base_class import Base
@@ -7,6 +7,10 @@ from app.db.base_class import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Dashboard status/priority buckets per meeting become an index-only scan
+        Index("ix_tasks_meeting_status_priority", "meeting_id", "status", "priority"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     meeting_id: Mapped[int] = mapped_column(ForeignKey("meetings.id", ondelete="CASCADE"), index=True)
@@ -57,6 +57,15 @@ class MeetingListOut(BaseModel):
         from_attributes = True
 
 
+class MediaUploadAccepted(BaseModel):
+    """Returned by upload-media while transcription runs in the background."""
+    id: int
+    meeting_id: int
+    title: str
+    job_id: str
+    status: str = "processing"
+
+
 class DashboardStats(BaseModel):
     total_meetings: int
     total_tasks: int
@@ -45,6 +45,39 @@ async def _run_ai_pipeline(meeting_id: int, job_id: str):
             await db.rollback()
             raise
 
+async def run_analysis_job(meeting_id: int, job_id: str) -> None:
+    """In-process counterpart of analyze_meeting_background for the API's event loop.
+
+    Drives the Job row through processing → completed/failed, so it can be
+    handed to BackgroundTasks when no Celery worker is available.
+    """
+    from app.db.session import AsyncSessionLocal
+    from app.ai.rag import rag_store
+    from sqlalchemy import update
+    from app.models.job import Job
+
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(update(Job).where(Job.id == job_id).values(status="processing", progress=10))
+            await session.commit()
+
+        result_id = await _run_ai_pipeline(meeting_id, job_id)
+        rag_store.invalidate(meeting_id)
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(update(Job).where(Job.id == job_id).values(
+                status="completed", progress=100, result_id=result_id
+            ))
+            await session.commit()
+    except Exception as exc:
+        logger.error(f"Analysis failed for job {job_id}: {exc}", exc_info=True)
+        async with AsyncSessionLocal() as session:
+            await session.execute(update(Job).where(Job.id == job_id).values(
+                status="failed", error=str(exc)
+            ))
+            await session.commit()
+
+
 @shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=5, retry_kwargs={"max_retries": 3})
 def analyze_meeting_background(self, meeting_id: int, job_id: str) -> dict:
     """
@@ -192,7 +192,7 @@ export const meetingsAPI = {
         return api.post('/meetings/upload-media', formData, {
             headers: { 'Content-Type': 'multipart/form-data' },
             timeout: 300000,
-        });
+        }).then(r => { invalidateCache('/meetings'); return r; });
     },
     // ── File Downloads (uses native Save-As dialog) ──
     downloadReport: (id) => _fetchAndSave(
@@ -522,6 +522,11 @@ export default function LiveMeetingPage() {
                         case 'participants':
                             setParticipants(data.participants || []);
                             break;
+                        case 'participants_delta': {
+                            const removed = new Set([...(data.remove || []), ...(data.add || []).map(p => p.id)]);
+                            setParticipants(prev => [...prev.filter(p => !removed.has(p.id)), ...(data.add || [])]);
+                            break;
+                        }
                         case 'SUBTITLE':
                             setSubtitles(prev => [...prev.slice(-50), data]);
                             break;
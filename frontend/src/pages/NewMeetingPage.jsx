@@ -1,7 +1,7 @@
 import { useState, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
-import { meetingsAPI, videoMeetingAPI } from '../api';
+import { meetingsAPI, videoMeetingAPI, aiAPI } from '../api';
 import { motion, AnimatePresence } from 'framer-motion';
 import {
     Video, Users, Copy, Check, ArrowRight, Sparkles,
@@ -93,17 +93,37 @@ export default function NewMeetingPage() {
         setUploadProgress('Uploading file to server...');
         const toastId = toast.loading('Processing video/audio... This may take 1-2 minutes');
         try {
-            setUploadProgress('Transcribing with AI...');
             const res = await meetingsAPI.uploadMedia(mediaFile, mediaTitle.trim());
-            const meeting = res.data;
-            toast.success(
-                `Transcript extracted! ${meeting.subtitle_count} lines. ${meeting.has_analysis ? 'AI analysis complete!' : 'Analyzing...'}`,
-                { id: toastId }
-            );
-            navigate(`/meetings/${meeting.id}`);
+            const { id: meetingId, job_id: jobId } = res.data;
+
+            // Transcription runs in the background — poll the job until it settles.
+            setUploadProgress('Transcribing with AI...');
+            let job = null;
+            for (let attempts = 0; attempts < 150; attempts++) {
+                await new Promise(resolve => setTimeout(resolve, 2000));
+                try {
+                    job = (await aiAPI.jobStatus(jobId)).data;
+                } catch (pollErr) {
+                    console.error('Job polling error', pollErr);
+                    continue;
+                }
+                if (job.status === 'completed' || job.status === 'failed') break;
+            }
+            if (job?.status === 'failed') {
+                throw new Error(job.error || 'Transcription failed');
+            }
+            if (job?.status !== 'completed') {
+                toast('Transcription is taking longer than usual. Check back shortly.', { id: toastId });
+                navigate(`/meetings/${meetingId}`);
+                return;
+            }
+
+            const meeting = (await meetingsAPI.get(meetingId)).data;
+            toast.success(`Transcript extracted! ${meeting.subtitle_count} lines.`, { id: toastId });
+            navigate(`/meetings/${meetingId}`);
         } catch (err) {
             toast.error(
-                err.response?.data?.detail || 'Failed to process file. Check format and try again.',
+                err.response?.data?.detail || err.message || 'Failed to process file. Check format and try again.',
                 { id: toastId }
             );
         } finally {
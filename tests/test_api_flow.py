@@ -17,6 +17,31 @@ Base.metadata.create_all(bind=engine)
 client = TestClient(app)
 
 
+def _auth_headers(email, password):
+    """Register + log in a fresh user, clear of the per-IP auth rate limits."""
+    from app.core.rate_limit import limiter
+
+    limiter.reset()
+    client.post("/api/v1/register", json={"email": email, "password": password})
+    token = client.post("/api/v1/login", json={"email": email, "password": password}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _live_user(email, password):
+    """(token, user id) of a fresh user, for WebSocket tests."""
+    headers = _auth_headers(email, password)
+    user_id = client.get("/api/v1/me", headers=headers).json()["id"]
+    return headers["Authorization"].split(" ", 1)[1], user_id
+
+
+def _receive_type(ws, event_type):
+    """Next message of the given type, skipping unrelated broadcasts."""
+    while True:
+        message = ws.receive_json()
+        if message["type"] == event_type:
+            return message
+
+
 def test_auth_and_refresh_flow():
     email = "user1@example.com"
     password = "testpassword123"
@@ -139,3 +164,302 @@ def test_task_due_date_roundtrip():
     matching = [t for t in listed.json() if t["id"] == task["id"]]
     assert matching
     assert matching[0]["status"] == "in-progress"
+
+
+def test_live_write_batch_survives_deleted_meeting(monkeypatch):
+    import asyncio
+
+    from sqlalchemy import text
+
+    from app.api.v1 import process_meeting
+    from app.models.chat_message import ChatMessage
+    from app.models.subtitle import Subtitle
+
+    headers = _auth_headers("live-writer@example.com", "livepass123")
+
+    live_id = client.post("/api/v1/meetings", json={"title": "Still live"}, headers=headers).json()["id"]
+    gone_id = client.post("/api/v1/meetings", json={"title": "Deleted mid-session"}, headers=headers).json()["id"]
+    assert client.delete(f"/api/v1/meetings/{gone_id}", headers=headers).status_code == 204
+
+    broadcasts = []
+
+    async def fake_broadcast(meeting_id, message, exclude=None):
+        broadcasts.append((meeting_id, dict(message)))
+
+    monkeypatch.setattr(process_meeting.manager, "broadcast", fake_broadcast)
+
+    def subtitle(meeting_id, text_):
+        row = {
+            "meeting_id": meeting_id, "speaker_id": "1", "speaker_name": "Ann", "text": text_,
+            "start_time": 0.0, "end_time": 0.0, "confidence": 1.0,
+        }
+        return (Subtitle, row, {"type": "SUBTITLE", "id": None, "text": text_})
+
+    def chat(meeting_id, text_):
+        row = {"meeting_id": meeting_id, "sender_name": "Ann", "sender_id": 1, "message": text_}
+        return (ChatMessage, row, {"type": "CHAT", "text": text_})
+
+    batch = [
+        subtitle(live_id, "first"), chat(gone_id, "lost chat"), subtitle(gone_id, "orphan"),
+        chat(live_id, "hello"), subtitle(live_id, "second"),
+    ]
+    asyncio.run(process_meeting._flush_rows(batch))
+
+    # Only rows that were saved are broadcast, in queue order
+    assert [(m, msg["text"]) for m, msg in broadcasts] == [
+        (live_id, "first"), (live_id, "hello"), (live_id, "second"),
+    ]
+    assert all(msg["id"] for _, msg in broadcasts if msg["type"] == "SUBTITLE")
+
+    fetched = client.get(f"/api/v1/meetings/{live_id}", headers=headers).json()
+    assert fetched["subtitle_count"] == 2
+    assert fetched["transcript"] == "Ann: first\nAnn: second"
+    with engine.connect() as conn:
+        orphans = conn.execute(text("SELECT COUNT(*) FROM subtitles WHERE meeting_id = :m"), {"m": gone_id})
+        assert orphans.scalar() == 0
+        chats = conn.execute(
+            text("SELECT meeting_id, message FROM chat_messages WHERE meeting_id IN (:a, :b)"),
+            {"a": live_id, "b": gone_id},
+        )
+        assert chats.all() == [(live_id, "hello")]
+
+
+def _meeting_counters(meeting_id):
+    """Stored denormalized counters next to the real row counts."""
+    from sqlalchemy import text
+
+    with engine.connect() as conn:
+        stored = conn.execute(
+            text("SELECT subtitle_count, task_count, has_analysis FROM meetings WHERE id = :m"),
+            {"m": meeting_id},
+        ).one()
+        actual = conn.execute(
+            text(
+                "SELECT (SELECT COUNT(*) FROM subtitles WHERE meeting_id = :m),"
+                " (SELECT COUNT(*) FROM tasks WHERE meeting_id = :m),"
+                " EXISTS (SELECT 1 FROM ai_results WHERE meeting_id = :m)"
+            ),
+            {"m": meeting_id},
+        ).one()
+    return (stored[0], stored[1], bool(stored[2])), (actual[0], actual[1], bool(actual[2]))
+
+
+def test_meeting_counters_follow_writes(monkeypatch):
+    from app.ai.orchestrator import AIAgentOrchestrator
+
+    headers = _auth_headers("counters@example.com", "counterpass123")
+
+    # create_meeting bulk-inserts the transcript's subtitles
+    created = client.post(
+        "/api/v1/meetings",
+        json={"title": "Counters", "transcript": "Ann: Kickoff\nBob: I will write the spec\nAnn: Ship Friday"},
+        headers=headers,
+    )
+    assert created.status_code == 201
+    meeting_id = created.json()["id"]
+    stored, actual = _meeting_counters(meeting_id)
+    assert stored == actual == (3, 0, False)
+
+    # Manual task (ORM insert listener)
+    task = client.post("/api/v1/tasks", json={"meeting_id": meeting_id, "title": "Book room"}, headers=headers)
+    assert task.status_code == 200
+    stored, actual = _meeting_counters(meeting_id)
+    assert stored == actual == (3, 1, False)
+
+    # AI analysis (AIResult insert listener), with Gemini stubbed out
+    async def fake_gemini(self, prompt, fallback):
+        return {
+            "summary": {"executive_summary": "Spec and ship."},
+            "action_items": [
+                {"task": "Write the spec", "owner": "Bob", "priority": "high"},
+                {"task": "Book room", "owner": "Ann", "priority": "low"},
+                {"task": "Ship release", "owner": "Ann", "priority": "medium"},
+            ],
+        }
+
+    monkeypatch.setattr(AIAgentOrchestrator, "_call_gemini", fake_gemini)
+    analyzed = client.post(f"/api/v1/ai/{meeting_id}/analyze", headers=headers)
+    assert analyzed.status_code == 200
+    job = client.get(f"/api/v1/ai/job-status/{analyzed.json()['job_id']}")
+    assert job.json()["status"] == "completed"
+    stored, actual = _meeting_counters(meeting_id)
+    assert stored == actual == (3, 1, True)
+
+    # Generated tasks (bulk insert; "Book room" already exists)
+    generated = client.post(f"/api/v1/meetings/{meeting_id}/generate-tasks", headers=headers)
+    assert generated.status_code == 200
+    assert len(generated.json()) == 2
+    stored, actual = _meeting_counters(meeting_id)
+    assert stored == actual == (3, 3, True)
+
+    # Task delete (single DELETE ... RETURNING)
+    deleted = client.delete(f"/api/v1/tasks/{generated.json()[0]['id']}", headers=headers)
+    assert deleted.status_code == 204
+    stored, actual = _meeting_counters(meeting_id)
+    assert stored == actual == (3, 2, True)
+
+    listed = client.get("/api/v1/meetings", headers=headers).json()
+    summary = next(m for m in listed if m["id"] == meeting_id)
+    assert (summary["subtitle_count"], summary["task_count"], summary["has_analysis"]) == (3, 2, True)
+
+
+def test_upload_media_transcribes_in_background(monkeypatch):
+    from app.api.v1 import meetings
+
+    headers = _auth_headers("uploader@example.com", "uploadpass123")
+    calls = []
+
+    async def fake_transcribe(media, content_type):
+        calls.append(content_type)
+        return "Ann: Welcome to the demo\nBob: Thanks, let's start"
+
+    monkeypatch.setattr(meetings, "_transcribe_with_gemini_async", fake_transcribe)
+
+    wav = b"RIFF" + b"\0" * 4 + b"WAVE" + b"\0" * 5000
+    upload = client.post(
+        "/api/v1/meetings/upload-media",
+        files={"file": ("demo.wav", wav, "audio/wav")},
+        data={"title": "Demo upload"},
+        headers=headers,
+    )
+    assert upload.status_code == 202
+    body = upload.json()
+    assert body["meeting_id"] == body["id"]
+    assert body["job_id"]
+    assert body["status"] == "processing"
+
+    # TestClient runs background tasks before returning, so the job has finished
+    job = client.get(f"/api/v1/ai/job-status/{body['job_id']}").json()
+    assert job["status"] == "completed"
+    assert job["result_id"] == body["meeting_id"]
+    assert calls == ["audio/wav"]
+
+    fetched = client.get(f"/api/v1/meetings/{body['meeting_id']}", headers=headers).json()
+    assert fetched["subtitle_count"] == 2
+    assert fetched["transcript"] == "Ann: Welcome to the demo\nBob: Thanks, let's start"
+
+
+def test_upload_media_marks_job_failed(monkeypatch):
+    from app.api.v1 import meetings
+
+    headers = _auth_headers("uploader-fail@example.com", "uploadpass123")
+
+    async def empty_transcript(media, content_type):
+        return ""
+
+    monkeypatch.setattr(meetings, "_transcribe_with_gemini_async", empty_transcript)
+
+    wav = b"RIFF" + b"\0" * 4 + b"WAVE" + b"\1" * 5000
+    upload = client.post(
+        "/api/v1/meetings/upload-media",
+        files={"file": ("silent.wav", wav, "audio/wav")},
+        headers=headers,
+    )
+    assert upload.status_code == 202
+    body = upload.json()
+
+    job = client.get(f"/api/v1/ai/job-status/{body['job_id']}").json()
+    assert job["status"] == "failed"
+    assert job["error"] == "Could not extract any transcript from this file."
+
+    # The placeholder meeting is removed along with the failed upload
+    fetched = client.get(f"/api/v1/meetings/{body['meeting_id']}", headers=headers)
+    assert fetched.status_code == 404
+    listed = client.get("/api/v1/meetings", headers=headers).json()
+    assert all(m["id"] != body["meeting_id"] for m in listed)
+
+
+def test_live_meeting_host_role_and_kick():
+    import json
+
+    import pytest
+    from starlette.websockets import WebSocketDisconnect
+
+    host_token, host_id = _live_user("live-host@example.com", "hostpass123")
+    guest_token, guest_id = _live_user("live-guest@example.com", "guestpass123")
+    watcher_token, _ = _live_user("live-watcher@example.com", "watchpass123")
+    meeting_id = client.post(
+        "/api/v1/meetings", json={"title": "Live kick"}, headers={"Authorization": f"Bearer {host_token}"}
+    ).json()["id"]
+
+    # One TestClient context so every socket shares the app's event loop
+    with TestClient(app) as live:
+        with live.websocket_connect(f"/api/v1/ws/meeting/{meeting_id}?token={host_token}") as host:
+            # The creator is the first connection and must stay host
+            assert _receive_type(host, "JOIN")["role"] == "host"
+
+            with live.websocket_connect(f"/api/v1/ws/meeting/{meeting_id}?token={watcher_token}") as watcher:
+                _receive_type(watcher, "participants")
+                with live.websocket_connect(f"/api/v1/ws/meeting/{meeting_id}?token={guest_token}") as guest:
+                    roster = _receive_type(guest, "participants")["participants"]
+                    assert {p["id"]: p["role"] for p in roster}[host_id] == "host"
+
+                    host.send_text(json.dumps({"type": "ADMIN_ACTION", "action": "KICK", "target_id": guest_id}))
+
+                    # The server closes the target's socket itself
+                    assert _receive_type(guest, "KICK_USER")["target_id"] == guest_id
+                    with pytest.raises(WebSocketDisconnect):
+                        guest.receive_json()
+
+                    assert _receive_type(watcher, "KICK_USER")["target_id"] == guest_id
+                    assert _receive_type(host, "KICK_USER")["target_id"] == guest_id
+
+
+def test_live_meeting_waiting_room_admit():
+    import json
+
+    host_token, _ = _live_user("wait-host@example.com", "hostpass123")
+    guest_token, guest_id = _live_user("wait-guest@example.com", "guestpass123")
+    meeting_id = client.post(
+        "/api/v1/meetings", json={"title": "Waiting room"}, headers={"Authorization": f"Bearer {host_token}"}
+    ).json()["id"]
+
+    with TestClient(app) as live:
+        with live.websocket_connect(f"/api/v1/ws/meeting/{meeting_id}?token={host_token}") as host:
+            host.send_text(json.dumps({"type": "ADMIN_UPDATE", "settings": {"waiting_room": True}}))
+            assert _receive_type(host, "SETTINGS_UPDATE")["settings"]["waiting_room"] is True
+
+            with live.websocket_connect(f"/api/v1/ws/meeting/{meeting_id}?token={guest_token}") as guest:
+                assert guest.receive_json()["type"] == "WAITING"
+                assert _receive_type(host, "WAITING_USER")["user_id"] == guest_id
+
+                host.send_text(json.dumps({"type": "ADMIN_ACTION", "action": "ADMIT", "target_id": guest_id}))
+
+                # The already-accepted socket joins without a second accept()
+                assert guest.receive_json()["type"] == "ADMITTED"
+                join = guest.receive_json()
+                assert join["type"] == "JOIN"
+                assert join["user_id"] == guest_id
+                roster = guest.receive_json()
+                assert roster["type"] == "participants"
+                assert guest_id in {p["id"] for p in roster["participants"]}
+
+
+def test_live_meeting_roster_snapshot_and_deltas():
+    import json
+
+    host_token, host_id = _live_user("roster-host@example.com", "hostpass123")
+    guest_token, guest_id = _live_user("roster-guest@example.com", "guestpass123")
+    meeting_id = client.post(
+        "/api/v1/meetings", json={"title": "Roster"}, headers={"Authorization": f"Bearer {host_token}"}
+    ).json()["id"]
+
+    with TestClient(app) as live:
+        with live.websocket_connect(f"/api/v1/ws/meeting/{meeting_id}?token={host_token}") as host:
+            assert [p["id"] for p in _receive_type(host, "participants")["participants"]] == [host_id]
+
+            with live.websocket_connect(f"/api/v1/ws/meeting/{meeting_id}?token={guest_token}") as guest:
+                # Newcomer gets the full roster, existing clients a one-entry delta
+                snapshot = _receive_type(guest, "participants")["participants"]
+                assert {p["id"] for p in snapshot} == {host_id, guest_id}
+
+                delta = _receive_type(host, "participants_delta")
+                assert set(delta) == {"type", "add"}
+                assert [p["id"] for p in delta["add"]] == [guest_id]
+                assert delta["add"][0]["role"] == "viewer"
+
+                # Read it while the guest session is open: leaving the block
+                # cancels the server task before its cleanup broadcasts
+                guest.send_text(json.dumps({"type": "LEAVE"}))
+                removed = _receive_type(host, "participants_delta")
+                assert removed == {"type": "participants_delta", "remove": [guest_id]}